@@ -0,0 +1,629 @@
+"""
+Agents for the headless 2048 game in game2048. An agent is anything with a
+next_move(board) method that takes a packed board and returns a direction
+(0 = left, 1 = right, 2 = up, 3 = down).
+"""
+
+import json
+import multiprocessing
+import random
+import time
+from collections import OrderedDict
+import board2048
+import boardnxn
+import heuristic2048
+from montecarlo2048 import MonteCarloAI
+from ntuple2048 import NTupleAI
+
+
+class RandomAI:
+    def __init__(self, seed=None, size=4):
+        self.rng = random.Random(seed)
+        self.engine = boardnxn.engine(size)
+
+    def next_move(self, board):
+        moves = self.engine.legal_moves(board)
+        return self.rng.choice(moves) if moves else 0
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class TranspositionTable:
+    def __init__(self, limit=1000000):
+        """
+        Bounded cache of searched positions, evicting the least recently used entry once
+        it holds more than limit entries. Keys are canonical boards (board2048.canonical),
+        so all 8 rotations and reflections of a position share one entry.
+        """
+        self.limit = limit
+        self.entries = OrderedDict()
+        # lookups whose entry was used as the node's value, and all the others; the searcher
+        # counts them, since only it knows whether an entry fits
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key, entry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.limit:
+            self.entries.popitem(last=False)
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+class SmartAI:
+    def __init__(self, depth=5, probability_cutoff=0.004, budget_ms=None, table_limit=1000000, weights=None,
+                 processes=None, cache_path=None, exact_reuse=None):
+        """
+        Parameters:
+            depth (int): Moves to look ahead (the cap when searching on a time budget).
+            probability_cutoff (float): Chance branches less likely than this are not searched.
+            budget_ms (float): Default time budget per move; None searches to a fixed depth.
+            table_limit (int): Transposition table entries kept before the oldest are evicted.
+            weights (dict): Keyword arguments for heuristic2048.RowHeuristic. The defaults
+                score boards exactly like grid_quality.
+            processes (int): If set, split the search below the first chance layer into
+                independent subtrees (see search_root_split), run on a pool of this many
+                processes. 1 runs the same split search in this process.
+            cache_path (str): If set, keep every move's result in this poscache2048 file and
+                play straight from it when a position comes up again, searched at least as deep.
+            exact_reuse (bool): Only reuse a table entry searched at the same depth and cumulative
+                probability (see max_node), which makes the search's result independent of what
+                the table holds. Entries then hardly ever carry over from one move to the next.
+                Defaults to True for a split search, which depends on it, and False otherwise.
+        """
+        self.depth = depth
+        self.probability_cutoff = probability_cutoff
+        self.budget_ms = budget_ms
+        self.heuristic = heuristic2048.RowHeuristic(**(weights or {}))
+        # canonical board -> (depth searched, value, best direction in the canonical frame,
+        # hit the depth limit); kept between moves
+        self.transposition_table = TranspositionTable(table_limit)
+        self.deadline = None
+        self.depth_limited = False
+        self.partial_values = {}
+        # search value of the move next_move returned last, and the depth it was searched to
+        self.last_value = None
+        self.last_depth = None
+        self.processes = processes
+        self.exact_reuse = bool(processes) if exact_reuse is None else exact_reuse
+        self.pool = None
+        self.split_worker = None
+        # what a split search worker needs to search exactly like this agent
+        self.worker_options = {
+            'depth': depth,
+            'probability_cutoff': probability_cutoff,
+            'table_limit': table_limit,
+            'weights': weights,
+            'exact_reuse': True,
+        }
+        self.position_cache = None
+        if cache_path:
+            from poscache2048 import PositionCache
+
+            config = json.dumps({'probability_cutoff': probability_cutoff, 'weights': weights}, sort_keys=True)
+            self.position_cache = PositionCache(cache_path, config)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool = None
+        if self.position_cache is not None:
+            self.position_cache.close()
+
+    def next_move(self, board, budget_ms=None):
+        """
+        Pick a direction for a board.
+
+        Parameters:
+            board (int): The packed board (see board2048).
+            budget_ms (float): If given (or set on the instance), deepen one level at a time
+                until the budget runs out (or deepening stops changing the search) and return
+                the best move from the last completed depth. Otherwise search to a fixed self.depth.
+
+        Returns:
+            int: 0 = left, 1 = right, 2 = up, 3 = down.
+        """
+        if budget_ms is None:
+            budget_ms = self.budget_ms
+        if self.position_cache is None:
+            return self.search(board, budget_ms)
+        key, symmetry = board2048.canonical(board)
+        entry = self.position_cache.get(key)
+        # on a budget, assume this search would get about as deep as the last one
+        wanted_depth = self.depth if budget_ms is None else min(self.last_depth or self.depth, self.depth)
+        if entry is not None and entry[0] >= wanted_depth:
+            self.last_value = entry[1]
+            return board2048.SYMMETRY_INVERSE[symmetry][entry[2]]
+        direction = self.search(board, budget_ms)
+        if self.last_depth and self.last_value is not None:
+            self.position_cache.put(key, (self.last_depth, self.last_value,
+                                          board2048.SYMMETRY_DIRECTIONS[symmetry][direction]))
+        return direction
+
+    def search(self, board, budget_ms):
+        """
+        next_move without the position cache.
+        """
+        if budget_ms is None:
+            best_direction, values = self.search_root(board, self.depth, board2048.legal_moves(board))
+            self.last_value = values.get(best_direction)
+            self.last_depth = self.depth
+            return best_direction
+
+        start = time.perf_counter()
+        self.deadline = start + budget_ms / 1000
+        order = board2048.legal_moves(board)
+        best_direction = order[0] if order else 0
+        self.last_value = None
+        self.last_depth = 0
+        last_duration = None
+        growth = 4
+        depth = 1
+        try:
+            while depth <= self.depth:
+                pass_start = time.perf_counter()
+                best_direction, values = self.search_root(board, depth, order)
+                self.last_value = values.get(best_direction)
+                self.last_depth = depth
+                # search the strongest moves first on the next pass
+                order = sorted(order, key=lambda d: -values[d])
+                duration = time.perf_counter() - pass_start
+                if last_duration:
+                    # early passes grow much faster than later ones, where the probability cutoff bites
+                    growth = min(max(duration / last_duration, 1.5), 8)
+                last_duration = duration
+                if not self.depth_limited:
+                    break
+                if time.perf_counter() + duration * growth > self.deadline:
+                    break
+                depth += 1
+        except SearchTimeout:
+            partial = self.partial_values
+            # the previous best was searched first, so anything that beat it at this depth is safe to use
+            if order and order[0] in partial:
+                best_direction = max(partial, key=lambda d: (partial[d], -order.index(d)))
+                self.last_value = partial[best_direction]
+        finally:
+            self.deadline = None
+        return best_direction
+
+    def search_root(self, board, depth, order):
+        """
+        Search each legal root move to the given depth, in the given order.
+
+        Returns:
+            tuple: (best direction, dict of direction -> value)
+        """
+        if self.processes:
+            return self.search_root_split(board, depth, order)
+        self.depth_limited = False
+        self.partial_values = {}
+        best_direction = order[0] if order else 0
+        best_value = -1
+        for d in order:
+            value = self.chance_node(board2048.move(board, d), depth, 1.0)
+            self.partial_values[d] = value
+            if value > best_value:
+                best_value = value
+                best_direction = d
+        return best_direction, self.partial_values
+
+    def search_root_split(self, board, depth, order):
+        """
+        search_root with every max node below the first chance layer searched as an
+        independent task with a fresh transposition table. With exact_reuse, max_node's value
+        only depends on its board, depth and probability, never on what the table already
+        holds, so the tasks give exactly the values an exact_reuse search_root would, on a pool
+        or one after another.
+
+        Returns:
+            tuple: (best direction, dict of direction -> value)
+        """
+        self.depth_limited = False
+        self.partial_values = {}
+        layout = []
+        tasks = []
+        # (canonical child, probability) -> task index; symmetric children are searched once
+        task_index = {}
+        for d in order:
+            moved_board = board2048.move(board, d)
+            cells = board2048.empty_cells(moved_board)
+            split = depth > 1 and cells and self.probability_cutoff <= 1.0
+            indices = []
+            if split:
+                for cell in cells:
+                    for exponent, weight in ((1, 0.9), (2, 0.1)):
+                        child = board2048.canonical(board2048.spawn(moved_board, cell, exponent))[0]
+                        # the same float chance_node would pass down, so entries match the serial search
+                        probability = 1.0 / len(cells) * weight
+                        key = (child, probability)
+                        if key not in task_index:
+                            task_index[key] = len(tasks)
+                            tasks.append((child, depth - 1, probability, self.deadline))
+                        indices.append(task_index[key])
+            layout.append((d, moved_board, cells, split, indices))
+
+        if self.processes > 1:
+            if self.pool is None:
+                self.pool = multiprocessing.Pool(self.processes, init_search_worker, (self.worker_options,))
+            results = self.pool.map(search_subtree, tasks)
+        else:
+            if self.split_worker is None:
+                self.split_worker = SmartAI(**self.worker_options)
+            results = [run_subtree(self.split_worker, task) for task in tasks]
+
+        best_direction = order[0] if order else 0
+        best_value = -1
+        for d, moved_board, cells, split, indices in layout:
+            if not split:
+                value = self.chance_node(moved_board, depth, 1.0)
+            else:
+                total = 0
+                for i, index in enumerate(indices):
+                    result = results[index]
+                    if result is None:
+                        raise SearchTimeout()
+                    self.depth_limited = self.depth_limited or result[1]
+                    total += result[0] * (0.1 if i & 1 else 0.9)
+                value = total / len(cells)
+            self.partial_values[d] = value
+            if value > best_value:
+                best_value = value
+                best_direction = d
+        return best_direction, self.partial_values
+
+    def max_node(self, board, depth, probability):
+        """
+        Value of the best move from a board. The canonical board is searched, so symmetric
+        boards get the same value. An entry searched at least as deep is reused, which is what
+        carries the table over from move to move. With exact_reuse, it is only reused for the
+        same depth and cumulative probability: the cutoff makes the value depend on both, and
+        reusing it for anything else makes results depend on the order boards were visited in.
+        Any other entry still decides which move is tried first.
+        """
+        key = board2048.canonical(board)[0]
+        table = self.transposition_table
+        entry = table.get(key)
+        if entry is not None and entry[0] >= depth and (
+                not self.exact_reuse or entry[0] == depth and entry[4] == probability):
+            table.hits += 1
+            self.depth_limited = self.depth_limited or entry[3]
+            return entry[1]
+        table.misses += 1
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+        moves = board2048.all_moves(key)
+        order = board2048.DIRECTIONS
+        if entry is not None:
+            order = (entry[2],) + tuple(d for d in order if d != entry[2])
+        outer_limited = self.depth_limited
+        self.depth_limited = False
+        best_value = 0
+        best_direction = order[0]
+        for d in order:
+            if moves[d] != key:
+                value = self.chance_node(moves[d], depth, probability)
+                if value > best_value:
+                    best_value = value
+                    best_direction = d
+        table.put(key, (depth, best_value, best_direction, self.depth_limited, probability))
+        self.depth_limited = self.depth_limited or outer_limited
+        return best_value
+
+    def chance_node(self, board, depth, probability):
+        """
+        Expected value over every tile spawn after a move: a 2 with probability 0.9 and a 4
+        with probability 0.1, in any empty cell. Branches whose cumulative probability drops
+        below the cutoff are scored directly instead of searched.
+        """
+        if probability < self.probability_cutoff:
+            return self.board_quality(board)
+        cells = board2048.empty_cells(board)
+        if not cells:
+            return self.board_quality(board)
+        total = 0
+        probability /= len(cells)
+        for cell in cells:
+            for exponent, weight in ((1, 0.9), (2, 0.1)):
+                child = board2048.spawn(board, cell, exponent)
+                if depth > 1:
+                    value = self.max_node(child, depth - 1, probability * weight)
+                else:
+                    self.depth_limited = True
+                    value = self.heuristic.score(child)
+                total += value * weight
+        return total / len(cells)
+
+    def board_quality(self, board):
+        return self.heuristic.score(board)
+
+    def grid_quality(self, grid):
+        mono_score = 0
+        traversals = self.build_traversals()
+        prev_value = -1
+        inc_score = 0
+        dec_score = 0
+        for x in traversals['x']:
+            prev_value = -1
+            inc_score = 0
+            dec_score = 0
+            for y in traversals['y']:
+                tile_value = grid[y][x] if grid[y][x] else 0
+                inc_score += tile_value
+                if tile_value <= prev_value or prev_value == -1:
+                    dec_score += tile_value
+                    if tile_value < prev_value:
+                        inc_score -= prev_value
+                prev_value = tile_value
+            mono_score += max(inc_score, dec_score)
+        for y in traversals['y']:
+            prev_value = -1
+            inc_score = 0
+            dec_score = 0
+            for x in traversals['x']:
+                tile_value = grid[y][x] if grid[y][x] else 0
+                inc_score += tile_value
+                if tile_value <= prev_value or prev_value == -1:
+                    dec_score += tile_value
+                    if tile_value < prev_value:
+                        inc_score -= prev_value
+                prev_value = tile_value
+            mono_score += max(inc_score, dec_score)
+        empty_score = len(self.available_cells(grid)) * 8
+        score = mono_score + empty_score
+        return score
+
+    def build_traversals(self):
+        return {
+            'x': range(4),
+            'y': range(4)
+        }
+
+    def available_cells(self, grid):
+        return [(r, c) for r in range(4) for c in range(4) if grid[r][c] == 0]
+
+
+class CountingTable(TranspositionTable):
+    """
+    TranspositionTable that also counts its entries by search depth. Every max node that is
+    actually expanded ends with exactly one put, so this counts expanded nodes per depth.
+    """
+    def __init__(self, limit=1000000, depth=5):
+        super().__init__(limit)
+        self.puts = [0] * (depth + 1)
+
+    def put(self, key, entry):
+        self.puts[entry[0]] += 1
+        super().put(key, entry)
+
+
+class ProfiledSmartAI(SmartAI):
+    def __init__(self, stats_path=None, **options):
+        """
+        SmartAI that records what each search did. It is a separate class so plain SmartAI
+        pays nothing for it.
+
+        After every next_move, last_stats holds:
+            expanded: max nodes expanded, indexed by remaining depth
+            chance_nodes: chance nodes searched, indexed by remaining depth
+            pruned: chance nodes scored directly because they fell under the probability cutoff
+            leaves: boards scored by the heuristic
+            table_hits, table_misses, hit_rate: transposition table lookups whose entry was
+                reused as the node's value, and the rest
+            passes: depth, seconds and whether it finished, for each iterative deepening pass
+            seconds, direction, value: the whole move
+
+        Parameters:
+            stats_path (str): If given, each move's stats are appended to it as a JSON line.
+            **options: SmartAI keyword arguments. Only this process is counted, not the
+                pool of a split search (processes=...).
+        """
+        super().__init__(**options)
+        self.transposition_table = CountingTable(self.transposition_table.limit, self.depth)
+        self.stats_path = stats_path
+        self.stats = None
+        self.last_stats = None
+        self.reset_game_stats()
+
+    def new_stats(self):
+        return {
+            'expanded': [0] * (self.depth + 1),
+            'chance_nodes': [0] * (self.depth + 1),
+            'pruned': 0,
+            'leaves': 0,
+            'table_hits': 0,
+            'table_misses': 0,
+            'passes': [],
+            'seconds': 0.0,
+        }
+
+    def next_move(self, board, budget_ms=None, record=True):
+        """
+        SmartAI.next_move, counting what the search did.
+
+        Parameters:
+            record (bool): False searches without keeping the stats: last_stats, game_stats and
+                stats_path are left alone. For speculative searches such as pondering.
+        """
+        table = self.transposition_table
+        hits, misses, puts = table.hits, table.misses, table.puts[:]
+        self.stats = stats = self.new_stats()
+        start = time.perf_counter()
+        direction = super().next_move(board, budget_ms)
+        stats['seconds'] = time.perf_counter() - start
+        stats['expanded'] = [after - before for after, before in zip(table.puts, puts)]
+        stats['table_hits'] = table.hits - hits
+        stats['table_misses'] = table.misses - misses
+        lookups = stats['table_hits'] + stats['table_misses']
+        stats['hit_rate'] = stats['table_hits'] / lookups if lookups else 0.0
+        stats['direction'] = direction
+        stats['value'] = self.last_value
+        self.stats = None
+        if not record:
+            return direction
+        self.last_stats = stats
+        self.add_game_stats(stats)
+        if self.stats_path:
+            with open(self.stats_path, 'a') as file:
+                file.write(json.dumps(stats) + '\n')
+        return direction
+
+    def add_game_stats(self, stats):
+        totals = self.game_stats
+        for key in ('expanded', 'chance_nodes'):
+            totals[key] = [total + n for total, n in zip(totals[key], stats[key])]
+        for key in ('pruned', 'leaves', 'table_hits', 'table_misses', 'seconds'):
+            totals[key] += stats[key]
+        totals['passes'] += len(stats['passes'])
+
+    def reset_game_stats(self):
+        """
+        Start summing game_stats afresh, e.g. at the start of a new game. They sum every
+        move's stats, except that passes is just a count.
+        """
+        self.game_stats = self.new_stats()
+        self.game_stats['passes'] = 0
+
+    def search_root(self, board, depth, order):
+        start = time.perf_counter()
+        completed = False
+        try:
+            result = super().search_root(board, depth, order)
+            completed = True
+            return result
+        finally:
+            self.stats['passes'].append({
+                'depth': depth,
+                'seconds': time.perf_counter() - start,
+                'completed': completed,
+            })
+
+    def chance_node(self, board, depth, probability):
+        stats = self.stats
+        if probability < self.probability_cutoff:
+            stats['pruned'] += 1
+            stats['leaves'] += 1
+        else:
+            cells = board2048.empty_count(board)
+            if not cells:
+                stats['leaves'] += 1
+            else:
+                stats['chance_nodes'][depth] += 1
+                if depth == 1:
+                    stats['leaves'] += 2 * cells
+        return super().chance_node(board, depth, probability)
+
+
+class ExpectimaxAI:
+    def __init__(self, size=4, depth=2, probability_cutoff=0.004):
+        """
+        Plain expectimax for any board size (see boardnxn), scored with grid_quality's
+        heuristic. No transposition table and no time budget; SmartAI is the 4x4 agent.
+
+        Parameters:
+            size (int): Cells per side of the boards it will be given.
+            depth (int): Moves to look ahead.
+            probability_cutoff (float): Chance branches less likely than this are not searched.
+        """
+        self.engine = boardnxn.engine(size)
+        self.depth = depth
+        self.probability_cutoff = probability_cutoff
+        self.quality = heuristic2048.RowHeuristic().score if size == 4 else self.engine.quality
+        self.last_value = None
+
+    def next_move(self, board):
+        best_direction = 0
+        best_value = None
+        for d, moved in enumerate(self.engine.all_moves(board)):
+            if moved != board:
+                value = self.chance_node(moved, self.depth, 1.0)
+                if best_value is None or value > best_value:
+                    best_value = value
+                    best_direction = d
+        self.last_value = best_value
+        return best_direction
+
+    def chance_node(self, board, depth, probability):
+        """
+        The same expectation as SmartAI.chance_node, so both agree on 4x4 boards.
+        """
+        cells = self.engine.empty_cells(board)
+        if probability < self.probability_cutoff or not cells:
+            return self.quality(board)
+        total = 0
+        probability /= len(cells)
+        for cell in cells:
+            for exponent, weight in ((1, 0.9), (2, 0.1)):
+                child = self.engine.spawn(board, cell, exponent)
+                if depth > 1:
+                    value = 0
+                    for moved in self.engine.all_moves(child):
+                        if moved != child:
+                            value = max(value, self.chance_node(moved, depth - 1, probability * weight))
+                else:
+                    value = self.quality(child)
+                total += value * weight
+        return total / len(cells)
+
+# One searcher per pool process for SmartAI.search_root_split
+search_worker = None
+
+
+def init_search_worker(options):
+    global search_worker
+    search_worker = SmartAI(**options)
+
+
+def run_subtree(worker, task):
+    """
+    Search one split-search subtree from scratch.
+
+    Returns:
+        tuple: (value, hit the depth limit), or None if the deadline passed.
+    """
+    board, depth, probability, deadline = task
+    worker.transposition_table.clear()
+    worker.depth_limited = False
+    worker.deadline = deadline
+    try:
+        value = worker.max_node(board, depth, probability)
+    except SearchTimeout:
+        return None
+    finally:
+        worker.deadline = None
+    return value, worker.depth_limited
+
+
+def search_subtree(task):
+    return run_subtree(search_worker, task)
+
+
+# Agents the tournament runner can build by name
+AGENTS = {
+    'random': RandomAI,
+    'smart': SmartAI,
+    'profiled': ProfiledSmartAI,
+    'ntuple': NTupleAI,
+    'expectimax': ExpectimaxAI,
+    'montecarlo': MonteCarloAI,
+}
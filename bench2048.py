@@ -0,0 +1,283 @@
+"""
+Benchmarks for the 2048 engine and AI.
+
+Every benchmark runs on fixed seeds: the positions come from seeded random
+games, and the games are seeded too, so two runs measure the same work.
+Each benchmark reports a rate (higher is better) and keeps the best of
+--repeat runs. Runs are appended to a JSON lines history, and --compare
+checks the new run against the previous one (or --baseline) and flags
+every rate that dropped by more than --threshold.
+
+    python bench2048.py
+    python bench2048.py --compare --threshold 0.1
+    python bench2048.py --only moves --only eval_table --no-save
+    python bench2048.py --check-split
+
+--check-split plays SmartAI's split search (processes=1 and 2) against the
+serial one with exact_reuse on the sample positions and exits non-zero if
+any move or root value differs.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import numpy as np
+import board2048
+import heuristic2048
+from ai2048 import ProfiledSmartAI, RandomAI, SmartAI
+from game2048 import Game, play_games
+from vecenv2048 import VecEnv, random_directions
+
+HISTORY_PATH = 'bench_2048.jsonl'
+POSITION_SEED = 2048
+POSITION_COUNT = 2000
+SEARCH_POSITIONS = 20
+SEARCH_DEPTH = 3
+
+
+def positions(n=POSITION_COUNT, seed=POSITION_SEED):
+    """
+    n positions sampled from seeded random games, the same on every run.
+    """
+    boards = []
+    game_seed = seed
+    while len(boards) < 4 * n:
+        game = Game(game_seed)
+        agent = RandomAI(game_seed)
+        while not game.is_over():
+            boards.append(game.board)
+            game.step(agent.next_move(game.board))
+        game_seed += 1
+    return random.Random(seed).sample(boards, n)
+
+
+def bench_moves(boards):
+    start = time.perf_counter()
+    for board in boards:
+        board2048.all_moves(board)
+    return 4 * len(boards), time.perf_counter() - start
+
+
+def bench_move_score(boards):
+    start = time.perf_counter()
+    for board in boards:
+        for d in board2048.DIRECTIONS:
+            board2048.move_score(board, d)
+    return 4 * len(boards), time.perf_counter() - start
+
+
+def bench_eval_table(boards):
+    score = heuristic2048.RowHeuristic().score
+    start = time.perf_counter()
+    for board in boards:
+        score(board)
+    return len(boards), time.perf_counter() - start
+
+
+def bench_eval_batch(boards):
+    heuristic = heuristic2048.RowHeuristic()
+    start = time.perf_counter()
+    heuristic.score_batch(boards)
+    return len(boards), time.perf_counter() - start
+
+
+def bench_eval_grid(boards):
+    ai = SmartAI()
+    grids = [board2048.to_grid(board) for board in boards]
+    start = time.perf_counter()
+    for grid in grids:
+        ai.grid_quality(grid)
+    return len(grids), time.perf_counter() - start
+
+
+def bench_vec_steps(boards):
+    env = VecEnv(10000, seed=POSITION_SEED)
+    rng = np.random.default_rng(POSITION_SEED)
+    moves = [random_directions(env.legal_moves(), rng) for _ in range(20)]
+    start = time.perf_counter()
+    for directions in moves:
+        env.step(directions)
+    return len(env) * len(moves), time.perf_counter() - start
+
+
+def bench_search_nodes(boards):
+    """
+    Max and chance nodes searched per second at a fixed depth, from an empty table each time.
+    """
+    ai = ProfiledSmartAI(depth=SEARCH_DEPTH)
+    nodes = 0
+    elapsed = 0
+    for board in boards[:SEARCH_POSITIONS]:
+        ai.transposition_table.clear()
+        start = time.perf_counter()
+        ai.next_move(board)
+        elapsed += time.perf_counter() - start
+        nodes += sum(ai.last_stats['expanded']) + sum(ai.last_stats['chance_nodes'])
+    return nodes, elapsed
+
+
+def bench_games_random(boards):
+    start = time.perf_counter()
+    play_games(200, RandomAI(POSITION_SEED), POSITION_SEED)
+    # games per minute
+    return 200 * 60, time.perf_counter() - start
+
+
+def bench_games_smart(boards):
+    start = time.perf_counter()
+    play_games(2, SmartAI(depth=1), POSITION_SEED)
+    return 2 * 60, time.perf_counter() - start
+
+
+def check_split_search(boards, processes=(1, 2)):
+    """
+    Compare SmartAI's split search against the serial one with exact_reuse on boards, with
+    fresh agents on each board and with agents that keep their tables from board to board.
+
+    Returns:
+        int: Boards where some split search picked another move or root value.
+    """
+    mismatches = 0
+    for fresh in (True, False):
+        agents = []
+        for board in boards[:SEARCH_POSITIONS]:
+            if fresh or not agents:
+                for ai in agents:
+                    ai.close()
+                agents = [SmartAI(depth=SEARCH_DEPTH, exact_reuse=True)]
+                agents += [SmartAI(depth=SEARCH_DEPTH, processes=n) for n in processes]
+            results = []
+            for ai in agents:
+                direction = ai.next_move(board)
+                results.append((direction, dict(ai.partial_values)))
+            if any(result != results[0] for result in results[1:]):
+                mismatches += 1
+                print(f"split search differs on board {board:#018x} ({'fresh' if fresh else 'kept'} tables)")
+        for ai in agents:
+            ai.close()
+    return mismatches
+
+
+# name -> (function of the position set returning (count, seconds), unit of count / seconds)
+BENCHMARKS = {
+    'moves': (bench_moves, 'moves/s'),
+    'move_score': (bench_move_score, 'moves/s'),
+    'eval_table': (bench_eval_table, 'boards/s'),
+    'eval_batch': (bench_eval_batch, 'boards/s'),
+    'eval_grid': (bench_eval_grid, 'boards/s'),
+    'vec_steps': (bench_vec_steps, 'steps/s'),
+    'search_nodes': (bench_search_nodes, 'nodes/s'),
+    'games_random': (bench_games_random, 'games/min'),
+    'games_smart': (bench_games_smart, 'games/min'),
+}
+
+
+def run_benchmarks(names=None, repeat=3):
+    """
+    Returns:
+        dict: benchmark name -> best rate over repeat runs.
+    """
+    boards = positions()
+    results = {}
+    for name in names or BENCHMARKS:
+        function, unit = BENCHMARKS[name]
+        best = 0
+        for _ in range(repeat):
+            count, seconds = function(boards)
+            best = max(best, count / seconds)
+        results[name] = best
+        print(f"{name:>14}: {best:14,.0f} {unit}")
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path=HISTORY_PATH):
+    try:
+        with open(path) as file:
+            return [json.loads(line) for line in file if line.strip()]
+    except FileNotFoundError:
+        return []
+
+
+def save_run(results, path=HISTORY_PATH):
+    run = {
+        'time': datetime.datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'results': results,
+    }
+    with open(path, 'a') as file:
+        file.write(json.dumps(run) + '\n')
+    return run
+
+
+def compare(results, baseline, threshold):
+    """
+    Print each rate against the baseline run.
+
+    Returns:
+        list of str: Benchmarks that got slower by more than threshold (0.1 = 10%).
+    """
+    regressions = []
+    print(f"\nAgainst {baseline.get('commit') or 'unknown commit'} ({baseline['time']}):")
+    for name, rate in results.items():
+        old = baseline['results'].get(name)
+        if not old:
+            continue
+        change = rate / old - 1
+        flag = ''
+        if change < -threshold:
+            flag = '  REGRESSION'
+            regressions.append(name)
+        print(f"{name:>14}: {change:+7.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the 2048 engine and AI.")
+    parser.add_argument('--only', action='append', choices=sorted(BENCHMARKS), help="run just these benchmarks")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--history', default=HISTORY_PATH)
+    parser.add_argument('--no-save', action='store_true', help="don't append this run to the history")
+    parser.add_argument('--compare', action='store_true', help="compare against the last saved run")
+    parser.add_argument('--baseline', type=int, default=-1, help="history index to compare against")
+    parser.add_argument('--threshold', type=float, default=0.1, help="slowdown flagged as a regression")
+    parser.add_argument('--check-split', action='store_true',
+                        help="check the split search against the serial one instead of benchmarking")
+    args = parser.parse_args()
+
+    if args.check_split:
+        mismatches = check_split_search(positions())
+        print(f"{mismatches} mismatching position(s)")
+        sys.exit(1 if mismatches else 0)
+
+    history = load_history(args.history)
+    results = run_benchmarks(args.only, args.repeat)
+    regressions = []
+    if args.compare:
+        if history:
+            regressions = compare(results, history[args.baseline], args.threshold)
+        else:
+            print(f"\nNo history in {args.history} to compare against.")
+    if not args.no_save:
+        save_run(results, args.history)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Cards and hands for the blackjack scripts.
+
+A card is an int from 0 to 51: suit SUITS[card // 13], rank
+RANKS[card % 13]. Everything about a card is a lookup in a 52-entry table
+(VALUES, HI_LO, ...), not a string comparison.
+
+A Hand keeps its hard total (Aces as 1), how many Aces it holds, its
+best total, whether an Ace is counted as 11 (soft), and whether it is
+two cards of the same rank (pair). add() updates all of it in O(1), so
+nothing walks the cards again to ask for a total.
+"""
+
+SUITS = ['♠', '♣', '♦', '♥']
+RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
+DECK_SIZE = 52
+ACE = RANKS.index('A')
+
+RANK_INDEX = [card % 13 for card in range(DECK_SIZE)]
+# blackjack value, 11 for an Ace
+VALUES = [11 if rank == ACE else min(rank + 2, 10) for rank in RANK_INDEX]
+# Hi-Lo count: +1 for 2-6, -1 for tens and Aces
+HI_LO = [1 if value < 7 else -1 if value > 9 else 0 for value in VALUES]
+NAMES = [f"{SUITS[card // 13]}{RANKS[card % 13]}" for card in range(DECK_SIZE)]
+
+
+def create_deck():
+    """
+    Returns:
+        list of int: One of each of the 52 cards.
+    """
+    return list(range(DECK_SIZE))
+
+
+def make_card(rank, suit='♠'):
+    return SUITS.index(suit) * 13 + RANKS.index(rank)
+
+
+def card_eval(card):
+    """
+    Returns:
+        int: The blackjack value of the card, 11 for an Ace.
+    """
+    return VALUES[card]
+
+
+def format_card(card):
+    return NAMES[card]
+
+
+class Hand:
+    __slots__ = ('cards', 'hard', 'aces', 'total', 'soft', 'pair', 'bet', 'name')
+
+    def __init__(self, cards=(), bet=0, name=''):
+        """
+        Parameters:
+            cards (iterable of int): The cards to start with.
+            bet (float): Money on the hand.
+            name (str): What the front-ends call the hand ('Player', 'Bot 2', ...).
+        """
+        self.cards = []
+        self.hard = 0
+        self.aces = 0
+        self.total = 0
+        self.soft = False
+        self.pair = False
+        self.bet = bet
+        self.name = name
+        for card in cards:
+            self.add(card)
+
+    def __len__(self):
+        return len(self.cards)
+
+    def __iter__(self):
+        return iter(self.cards)
+
+    def __repr__(self):
+        return f"Hand({display_hand(self)})"
+
+    def add(self, card):
+        cards = self.cards
+        cards.append(card)
+        if RANK_INDEX[card] == ACE:
+            self.hard += 1
+            self.aces += 1
+        else:
+            self.hard += VALUES[card]
+        # one Ace can count 11 whenever that doesn't bust the hand
+        self.soft = self.aces > 0 and self.hard <= 11
+        self.total = self.hard + 10 if self.soft else self.hard
+        self.pair = len(cards) == 2 and RANK_INDEX[cards[0]] == RANK_INDEX[card]
+
+
+def hand_eval(hand):
+    """
+    Returns:
+        int: The total of a Hand or a list of cards, counting Aces as 1 where 11 would bust.
+    """
+    if isinstance(hand, Hand):
+        return hand.total
+    return Hand(hand).total
+
+
+def display_hand(hand):
+    """
+    A hand of cards, formatted, followed by its total.
+    """
+    formatted_hand = ' '.join([f"|{NAMES[card]}|" for card in hand])
+    return f"{formatted_hand} TOTAL: {hand_eval(hand)}"
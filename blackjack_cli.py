@@ -0,0 +1,192 @@
+"""
+Terminal front-end pieces shared by bot_blackjack.py, simple_blackjack.py and
+blkjk2.py: a Printer that narrates a blackjack_engine.Table, a HumanStrategy
+that asks for every decision with input(), and play_session(), which handles
+buying back in and quitting around Table.play_round().
+"""
+
+import time
+from blackjack_cards import display_hand
+from blackjack_engine import DOUBLE, SPLIT, START_BALANCE, STAND
+
+HANGMAN = r"""
+                _________
+                |/      |
+                |      (_)
+                |      \|/
+                |       |
+                |      / \
+                |
+             ___|___
+            """
+OPTION_NAMES = {'h': "Hit (h)", 's': "Stand (s)", 'd': "Double Down (d)", 'sp': "Split (sp)"}
+
+
+def hidden_dealer(upcard):
+    return display_hand([upcard]).replace(' TOTAL', " |?| TOTAL")
+
+
+class Printer:
+    def __init__(self, delay=0):
+        """
+        Parameters:
+            delay (float): Seconds to wait after each card and decision, so a game can be followed.
+        """
+        self.delay = delay
+
+    def __call__(self, event, *args):
+        getattr(self, event)(*args)
+
+    def pause(self):
+        if self.delay:
+            time.sleep(self.delay)
+
+    def shuffle(self):
+        print("New Shoe!")
+
+    def balance(self, seat):
+        print(f"\n{seat.name} has ${seat.balance:.2f}")
+
+    def bet(self, seat, bet):
+        print(f"{seat.name} bets ${bet}")
+
+    def blackjack(self, seat, hand, dealer, checks):
+        print(f"\n{hand.name} Hand: {display_hand(hand)}")
+        print(f"Dealer Hand: {display_hand(dealer)}")
+        print(f"{seat.name} got Blackjack!!!" if checks == 1 else 'Yikes... the dealer has one too.')
+
+    def surrender(self, seat, hand, dealer_blackjack):
+        print(f"\n{hand.name} surrenders: {display_hand(hand)}")
+        print('Good call.' if dealer_blackjack else "Little baby got scared.")
+
+    def dealer_blackjack(self, seat, hand, dealer):
+        print(HANGMAN)
+        print(f"Dealer Hand: {display_hand(dealer)}")
+
+    def turn(self, seat, hand, upcard):
+        if hand.name == seat.name:
+            print(f"\n---{seat.name} Turn---")
+        else:
+            print(f"\n-{hand.name} Hand-")
+        print(f"Dealer's Hand: {hidden_dealer(upcard)}")
+        print(f"{hand.name} Hand: {display_hand(hand)}\n")
+
+    def action(self, seat, hand, action):
+        if action == STAND:
+            print(f"{hand.name} stands.")
+        elif action == DOUBLE:
+            print(f"{hand.name} doubles down.")
+        elif action == SPLIT:
+            print(f"{hand.name} splits.")
+        self.pause()
+
+    def card(self, seat, hand):
+        print(display_hand(hand))
+        if hand.total > 21:
+            print('Busted')
+        self.pause()
+
+    def dealer_turn(self, seats, dealer):
+        print("\n---Dealer's Turn---")
+        for seat in seats:
+            for hand in seat.hands:
+                print(f"{hand.name} Hand: {display_hand(hand)}")
+        print(f"\nDealer Hand: {display_hand(dealer)}")
+        self.pause()
+
+    def dealer_hit(self, dealer):
+        print(f"Dealer hits: {display_hand(dealer)}")
+        self.pause()
+
+    def dealer_done(self, dealer):
+        print("Dealer busted." if dealer.total > 21 else "Dealer stands.")
+
+    def final(self, dealer):
+        print("\n---Final---")
+        print(f"Dealer's Hand: {display_hand(dealer)}")
+
+    def result(self, seat, hand, returned):
+        print(f"{hand.name} Hand: {display_hand(hand)}")
+        if returned > hand.bet:
+            print(f"{hand.name} wins.")
+        elif returned == hand.bet:
+            print("Its a push.")
+        else:
+            print(f"{hand.name} loses.")
+
+    def round_end(self, table):
+        print(f"\nRunning count: {table.shoe.count}")
+        print(f"True count: {table.true_count:.0f}")
+        self.pause()
+
+
+def ask_yes_no(prompt):
+    while True:
+        answer = input(prompt).lower()
+        if answer == 'y':
+            return True
+        elif answer == 'n':
+            return False
+        print("Invalid input. Enter Y or N.")
+
+
+class HumanStrategy:
+    """
+    Every bet and decision typed in at the terminal.
+    """
+
+    def bet(self, seat, true_count):
+        while True:
+            try:
+                bet = int(input("Enter your bet amount (0 to quit): $"))
+            except ValueError:
+                print("Invalid input. Please enter an integer value.")
+                continue
+            if 0 <= bet <= seat.balance:
+                return bet
+            print(f"Invalid bet. Please enter a value between 1 and {seat.balance:.0f}.")
+
+    def surrender(self, seat, hand, upcard):
+        print(f"\nDealer's Hand: {hidden_dealer(upcard)}")
+        print(f"{hand.name} Hand: {display_hand(hand)}")
+        return ask_yes_no("Surrender? (Y/N) ")
+
+    def decide(self, seat, hand, upcard, first_turn, options):
+        prompt = ' / '.join(OPTION_NAMES[option] for option in options) + ' '
+        while True:
+            choice = input(prompt).lower()
+            if choice in options:
+                return choice
+            print("Invalid input.")
+
+    def rebuy(self, seat):
+        return ask_yes_no("You have no money. Take out a loan? (Y/N) ")
+
+
+def play_session(table, rounds=None):
+    """
+    Play rounds until rounds have been played, a seat leaves (bets 0), or a broke seat won't buy back in.
+    """
+    played = 0
+    while rounds is None or played < rounds:
+        for seat in table.seats:
+            if seat.balance < 1:
+                if not seat.strategy.rebuy(seat):
+                    loss = START_BALANCE * (seat.rebuys + 1)
+                    print(f"{seat.name} bought back in {seat.rebuys} times and lost a total of ${loss}.")
+                    seat.left = True
+                    break
+                seat.balance = START_BALANCE
+                seat.rebuys += 1
+                print(f"{seat.name} buys back in. Now you can make gazillions.")
+        if any(seat.left for seat in table.seats):
+            break
+        table.play_round()
+        if any(seat.left for seat in table.seats):
+            break
+        played += 1
+    print()
+    for seat in table.seats:
+        net = seat.balance - START_BALANCE * (seat.rebuys + 1)
+        print(f"{seat.name}'s net: ${net:.2f} over {seat.rounds} hands, bought back in {seat.rebuys} times.")
+    print("See you next week!")
@@ -0,0 +1,484 @@
+"""
+Headless blackjack: the rules of bot_blackjack.py, simple_blackjack.py and
+blkjk2.py without any printing or input.
+
+A Table holds a Shoe and one or more Seats. Each Seat has a balance and a
+strategy, an object with
+
+    bet(seat, true_count) -> int                          0 leaves the table
+    surrender(seat, hand, upcard) -> bool                 asked when the dealer shows an Ace
+    decide(seat, hand, upcard, first_turn, options) -> str    one of options ('h', 's', 'd', 'sp')
+    rebuy(seat) -> bool                                   asked by sessions when the seat is broke
+
+BotStrategy is the counting bot of bot_blackjack.py, playing a strategy chart
+from blackjack_strategy. Table.play_round()
+deals one round and settles it the way the scripts do:
+
+    - blackjack pays 3:2, blackjack against blackjack pushes
+    - with an Ace up a hand may surrender half its bet; otherwise a dealer
+      blackjack takes it. There is no peek under a 10.
+    - doubling on the first two cards, splitting equal values, doubling
+      and resplitting after a split
+    - the dealer hits below 17 and stands on soft 17 (or hits it, with hit_soft_17)
+    - a win pays even money, ties push
+
+The shoe is a preallocated array of card ints (see blackjack_cards), dealt
+by moving a pointer, and keeps the Hi-Lo running count. When its cut card
+comes out, it is reshuffled after the round. Shuffles and cut cards come
+from a seeded numpy Generator, so a seed and the same decisions replay
+the same rounds. A table with an observer calls observer(event, *args) at each
+step; the front-ends print from there.
+
+    python blackjack_engine.py --hands 1000000 --seed 1
+"""
+
+import argparse
+import math
+import time
+import numpy as np
+from blackjack_cards import DECK_SIZE, HI_LO, VALUES, Hand
+from blackjack_strategy import (DEFAULT_CHART, DOUBLE_HIT, HARD, HIT as HIT_CODE, PAIR, SOFT, SPLIT_HIT,
+                                STAND as STAND_CODE, TOTALS, UPCARDS, load_chart)
+
+START_BALANCE = 100
+HIT, STAND, DOUBLE, SPLIT = 'h', 's', 'd', 'sp'
+# shoes shuffled at a time by simulations
+SHOE_BATCH = 64
+# the cut card comes out after this fraction of the shoe, drawn between the two
+PENETRATION = (0.88, 0.915)
+
+
+def check_blkjk(player, dealer):
+    """
+    Parameters:
+        player (Hand): The player's first two cards.
+        dealer (Hand): The dealer's first two cards.
+
+    Returns:
+        int: 1 if only the player has blackjack, 2 if both do, 3 if only the dealer does, else None.
+    """
+    player_b = player.total == 21
+    dealer_b = dealer.total == 21
+    if player_b and not dealer_b:
+        return 1
+    elif player_b and dealer_b:
+        return 2
+    elif dealer_b and not player_b:
+        return 3
+    else:
+        return None
+
+
+def cut_range_for(decks, cut_range=None):
+    """
+    The cut card range for a shoe of decks decks.
+
+    Parameters:
+        decks (int): Decks in the shoe.
+        cut_range (tuple): A range to check against the shoe; None for the default, PENETRATION of
+            the shoe ((275, 285) for six decks).
+
+    Returns:
+        tuple: Lowest and highest number of cards dealt before the cut card.
+    """
+    size = decks * DECK_SIZE
+    if cut_range is None:
+        cut_range = (round(size * PENETRATION[0]), round(size * PENETRATION[1]))
+    if not 0 < cut_range[0] <= cut_range[1] < size:
+        raise ValueError(f"cut_range {tuple(cut_range)} does not fit a {decks}-deck shoe of {size} cards")
+    return tuple(cut_range)
+
+
+def settle(player_points, dealer_points, bet):
+    """
+    What a finished hand gets back at the end of the round.
+
+    Returns:
+        float: 2 * bet for a win, bet for a push, 0 for a loss.
+    """
+    if player_points > 21:
+        return 0
+    elif dealer_points > 21 or player_points > dealer_points:
+        return bet * 2
+    elif player_points == dealer_points:
+        return bet
+    else:
+        return 0
+
+
+class Shoe:
+    def __init__(self, seed=None, decks=6, cut_range=None, batch=1):
+        """
+        Parameters:
+            seed (int): Seed for the shuffles and cut card positions.
+            decks (int): Number of standard decks in the shoe.
+            cut_range (tuple): The cut card comes out after between this many cards (inclusive).
+                None derives it from the shoe size (see cut_range_for).
+            batch (int): Shoes shuffled at a time. Simulations use a few dozen; each shuffle then
+                permutes all of them in one call.
+        """
+        self.rng = np.random.default_rng(seed)
+        self.decks = decks
+        self.cut_range = cut_range_for(decks, cut_range)
+        self.size = decks * DECK_SIZE
+        # batch x size card ints, shuffled in place; row i is the i-th shoe of the batch
+        self.shoes = np.tile(np.arange(DECK_SIZE, dtype=np.int8), (batch, decks))
+        self.batch = []
+        self.cuts = []
+        # the shoe being dealt, the deal pointer into it and the cut card's position
+        self.cards = []
+        self.next = 0
+        self.cut = 0
+        self.count = 0
+        self.reshuffle = False
+        self.shuffle()
+
+    def __len__(self):
+        return self.size - self.next
+
+    def shuffle(self):
+        """
+        Move on to the next shoe of the batch, shuffling a new batch when it runs out.
+        """
+        if not self.batch:
+            self.rng.permuted(self.shoes, axis=1, out=self.shoes)
+            # dealt from lists: reading a Python int is much cheaper than indexing a numpy array
+            self.batch = self.shoes.tolist()
+            self.cuts = self.rng.integers(self.cut_range[0], self.cut_range[1] + 1, len(self.batch)).tolist()
+        self.cards = self.batch.pop()
+        # at least one card stays behind the cut card, so it always comes out before the shoe runs dry
+        self.cut = min(self.cuts.pop(), self.size - 1)
+        self.next = 0
+        self.count = 0
+        self.reshuffle = False
+
+    def draw(self):
+        """
+        Deal the next card and update the running count (+1 for 2-6, -1 for tens and Aces).
+        """
+        i = self.next
+        if i == self.size:
+            # a round that ran the shoe dry carries on with a fresh one, itself reshuffled after the round
+            self.shuffle()
+            self.reshuffle = True
+            i = 0
+        elif i >= self.cut:
+            self.reshuffle = True
+        self.next = i + 1
+        card = self.cards[i]
+        self.count += HI_LO[card]
+        return card
+
+    def true_count(self):
+        """
+        The running count per 50 cards left, 0 with none left.
+        """
+        left = self.size - self.next
+        return self.count / (left / 50) if left else 0.0
+
+
+class Seat:
+    def __init__(self, name, strategy, balance=START_BALANCE):
+        """
+        Parameters:
+            name (str): Names the seat's hands; split hands are '<name> 1', '<name> 2', ...
+            strategy: Makes the seat's bets and decisions (see the module docstring).
+            balance (float): Money at the seat. math.inf never runs out.
+        """
+        self.name = name
+        self.strategy = strategy
+        self.balance = balance
+        # this round's Hands
+        self.hands = []
+        self.splits = 0
+        self.rounds = 0
+        self.wagered = 0
+        self.net = 0
+        self.rebuys = 0
+        self.left = False
+
+
+class Table:
+    def __init__(self, seats, decks=6, cut_range=None, seed=None, observer=None, hit_soft_17=False,
+                 shoe_batch=1):
+        """
+        Parameters:
+            seats (list of Seat): Played in order, each against the same dealer hand.
+            decks (int): Decks in the shoe.
+            cut_range (tuple): Cards dealt before the cut card, drawn uniformly from this range. None
+                scales it to the shoe (see cut_range_for).
+            seed (int): Seed for every shuffle.
+            observer (callable): Called as observer(event, *args) as the round goes; None for no events.
+            hit_soft_17 (bool): The dealer hits soft 17 (H17) instead of standing (S17).
+            shoe_batch (int): Shoes shuffled at a time (see Shoe).
+        """
+        self.seats = seats
+        self.observer = observer
+        self.hit_soft_17 = hit_soft_17
+        self.shoe = Shoe(seed, decks, cut_range, shoe_batch)
+        self.dealer = Hand(name='Dealer')
+        self.true_count = 0
+        self.rounds = 0
+        if observer:
+            observer('shuffle')
+
+    def play_round(self):
+        """
+        Deal and settle one round.
+
+        Returns:
+            list of tuple: (seat, first bet, net winnings) for each seat that bet.
+        """
+        shoe = self.shoe
+        observer = self.observer
+        self.true_count = true_count = shoe.true_count()
+        playing = []
+        for seat in self.seats:
+            seat.hands = []
+            seat.splits = 0
+            if seat.left:
+                continue
+            if observer:
+                observer('balance', seat)
+            bet = seat.strategy.bet(seat, true_count)
+            if bet > 0:
+                seat.balance -= bet
+                seat.hands.append(Hand(bet=bet, name=seat.name))
+                playing.append((seat, bet))
+                if observer:
+                    observer('bet', seat, bet)
+            else:
+                seat.left = True
+        if not playing:
+            return []
+        for seat, _ in playing:
+            hand = seat.hands[0]
+            hand.add(shoe.draw())
+            hand.add(shoe.draw())
+        self.dealer = dealer = Hand([shoe.draw(), shoe.draw()], name='Dealer')
+
+        # (seat, first bet, money staked, money back)
+        ledger = []
+        live = []
+        upcard = dealer.cards[0]
+        ace_up = VALUES[upcard] == 11
+        for seat, bet in playing:
+            hand = seat.hands[0]
+            checks = check_blkjk(hand, dealer)
+            if checks == 1 or checks == 2:
+                back = bet * 2.5 if checks == 1 else bet
+                if observer:
+                    observer('blackjack', seat, hand, dealer, checks)
+                ledger.append((seat, bet, bet, back))
+            elif ace_up and seat.strategy.surrender(seat, hand, upcard):
+                if observer:
+                    observer('surrender', seat, hand, checks == 3)
+                ledger.append((seat, bet, bet, bet / 2))
+            elif ace_up and checks == 3:
+                if observer:
+                    observer('dealer_blackjack', seat, hand, dealer)
+                ledger.append((seat, bet, bet, 0))
+            else:
+                live.append((seat, bet))
+
+        for seat, _ in live:
+            self.play_seat(seat)
+
+        if any(hand.total <= 21 for seat, _ in live for hand in seat.hands):
+            if observer:
+                observer('dealer_turn', [seat for seat, _ in live], dealer)
+            while dealer.total < 17 or (dealer.total == 17 and dealer.soft and self.hit_soft_17):
+                dealer.add(shoe.draw())
+                if observer:
+                    observer('dealer_hit', dealer)
+            if observer:
+                observer('dealer_done', dealer)
+
+        dealer_points = dealer.total
+        if live and observer:
+            observer('final', dealer)
+        for seat, bet in live:
+            staked = 0
+            back = 0
+            for hand in seat.hands:
+                staked += hand.bet
+                returned = settle(hand.total, dealer_points, hand.bet)
+                back += returned
+                if observer:
+                    observer('result', seat, hand, returned)
+            ledger.append((seat, bet, staked, back))
+
+        results = []
+        for seat, bet, staked, back in ledger:
+            seat.balance += back
+            seat.rounds += 1
+            seat.wagered += staked
+            seat.net += back - staked
+            results.append((seat, bet, back - staked))
+        self.rounds += 1
+        if observer:
+            observer('round_end', self)
+        if shoe.reshuffle:
+            shoe.shuffle()
+            if observer:
+                observer('shuffle')
+        return results
+
+    def play_seat(self, seat):
+        """
+        Play out every hand of a seat, splits included, in the order they were made.
+        """
+        hands = seat.hands
+        i = 0
+        while i < len(hands):
+            if not self.play_hand(seat, hands[i]):
+                i += 1
+
+    def play_hand(self, seat, hand):
+        """
+        Take decisions for one hand until it stands, busts, doubles, reaches 21 or splits.
+
+        Returns:
+            bool: True if the hand was split into two new hands at the end of seat.hands.
+        """
+        shoe = self.shoe
+        observer = self.observer
+        upcard = self.dealer.cards[0]
+        first_turn = True
+        if observer:
+            observer('turn', seat, hand, upcard)
+        while hand.total < 21:
+            options = [HIT, STAND]
+            if first_turn and seat.balance >= hand.bet:
+                options.append(DOUBLE)
+                if VALUES[hand.cards[0]] == VALUES[hand.cards[1]]:
+                    options.append(SPLIT)
+            action = seat.strategy.decide(seat, hand, upcard, first_turn, options)
+            if action not in options:
+                raise ValueError(f"{seat.name} chose {action!r}, not one of {options}")
+            if observer:
+                observer('action', seat, hand, action)
+            if action == STAND:
+                return False
+            if action == SPLIT:
+                seat.balance -= hand.bet
+                seat.hands.remove(hand)
+                for card in hand.cards:
+                    seat.splits += 1
+                    seat.hands.append(Hand([card, shoe.draw()], hand.bet, f"{seat.name} {seat.splits}"))
+                return True
+            if action == DOUBLE:
+                seat.balance -= hand.bet
+                hand.bet *= 2
+            hand.add(shoe.draw())
+            if observer:
+                observer('card', seat, hand)
+            if action == DOUBLE:
+                break
+            first_turn = False
+        return False
+
+
+def bot_logic(chart, hand, dealer_card, first_turn, balance):
+    """
+    Decide the bot's action from a compiled strategy chart.
+
+    Parameters:
+        chart (blackjack_strategy.Chart): The bot's basic strategy.
+        hand (Hand): The bot's hand.
+        dealer_card (int): The dealer's upcard.
+        first_turn (bool): Whether this is the hand's first decision.
+        balance (float): Money the bot has left.
+
+    Returns:
+        str: The action the bot should take ('h' for hit, 's' for stand, 'd' for double down, 'sp' for split).
+    """
+    if hand.pair:
+        kind, total = PAIR, VALUES[hand.cards[0]]
+    else:
+        kind, total = SOFT if hand.soft else HARD, hand.total
+    code = chart.lookup[(kind * TOTALS + total) * UPCARDS + VALUES[dealer_card]]
+    bet = hand.bet
+    if code == HIT_CODE:
+        return HIT
+    elif code == STAND_CODE:
+        return STAND
+    elif code == SPLIT_HIT:
+        return SPLIT if kind == PAIR and balance >= bet else HIT
+    elif first_turn and balance >= bet * 2:
+        return DOUBLE
+    return HIT if code == DOUBLE_HIT else STAND
+
+
+def get_bet(true_count, balance):
+    """
+    The bot's bet: ten times the true count between 2 and 6, 60 above 6, 1 otherwise.
+    """
+    if 2 < true_count < 6:
+        bet = min(true_count * 10, balance)
+    elif true_count > 6:
+        bet = min(60, balance)
+    else:
+        bet = min(1, balance)
+    return math.floor(bet)
+
+
+class BotStrategy:
+    """
+    The counting bot: get_bet for bets, bot_logic for decisions, surrender on 15 or 16, and
+    always buy back in.
+    """
+
+    def __init__(self, chart=DEFAULT_CHART):
+        """
+        Parameters:
+            chart (str): Strategy chart file, or the name of one in strategy_charts/.
+        """
+        self.chart = load_chart(chart)
+
+    def bet(self, seat, true_count):
+        return get_bet(true_count, seat.balance)
+
+    def surrender(self, seat, hand, upcard):
+        return hand.total in (15, 16)
+
+    def decide(self, seat, hand, upcard, first_turn, options):
+        return bot_logic(self.chart, hand, upcard, first_turn, seat.balance)
+
+    def rebuy(self, seat):
+        return True
+
+
+def simulate(hands, seed=None, decks=6, cut_range=None, strategy=None, hit_soft_17=False,
+             shoe_batch=SHOE_BATCH):
+    """
+    Play hands rounds with one seat and an unlimited bankroll.
+
+    Returns:
+        Seat: The seat, with its rounds, wagered and net totals.
+    """
+    seat = Seat('Bot', strategy or BotStrategy(), balance=math.inf)
+    table = Table([seat], decks, cut_range, seed, hit_soft_17=hit_soft_17, shoe_batch=shoe_batch)
+    for _ in range(hands):
+        table.play_round()
+    return seat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate the blackjack bot without printing.")
+    parser.add_argument('--hands', type=int, default=1000000)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--decks', type=int, default=6)
+    parser.add_argument('--chart', default=DEFAULT_CHART, help="strategy chart file, or 's17' / 'h17'")
+    parser.add_argument('--h17', action='store_true', help="the dealer hits soft 17")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    seat = simulate(args.hands, args.seed, args.decks, strategy=BotStrategy(args.chart), hit_soft_17=args.h17)
+    elapsed = time.perf_counter() - start
+    print(f"{seat.rounds} hands in {elapsed:.1f}s ({seat.rounds / elapsed:,.0f} hands/s)")
+    print(f"Net: ${seat.net:,.2f} on ${seat.wagered:,.2f} wagered ({seat.net / seat.wagered:+.4%})")
+
+
+if __name__ == "__main__":
+    main()
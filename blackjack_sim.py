@@ -0,0 +1,301 @@
+"""
+Long blackjack_engine simulations across a process pool.
+
+The hands are cut into shards of shard_size rounds. Shard i gets its own
+seed from a numpy SeedSequence spawned from the run's seed, so shards are
+independent streams and a run gives the same shards however many
+processes play them. A worker does not send its hands back. It returns a
+Tally: the count, sum and sum of squares of the net result per hand,
+overall and per true count. Tallies merge by adding, so the driver only
+ever holds one per shard.
+
+Every finished shard is appended to a JSON lines checkpoint, so a killed
+run picks up where it left off. Shards already in the file (with the same
+settings) are not played again. --report-only reports each set of settings
+in the file separately.
+
+    python blackjack_sim.py --hands 100000000 --checkpoint sim_blackjack.jsonl
+    python blackjack_sim.py --report-only --checkpoint sim_blackjack.jsonl
+"""
+
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import time
+import numpy as np
+from blackjack_engine import SHOE_BATCH, BotStrategy, Seat, Table, cut_range_for
+from blackjack_strategy import DEFAULT_CHART, chart_id
+
+SHARD_SIZE = 200000
+Z_95 = 1.96
+# true counts are tallied rounded and clamped to this range
+TRUE_COUNT_LIMIT = 10
+
+
+class Accumulator:
+    """
+    Count, sum and sum of squares of a stream of values; enough for the mean, variance and
+    confidence interval, and mergeable by adding.
+    """
+
+    def __init__(self, count=0, total=0.0, squares=0.0):
+        self.count = count
+        self.total = total
+        self.squares = squares
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        self.squares += value * value
+
+    def merge(self, other):
+        self.count += other.count
+        self.total += other.total
+        self.squares += other.squares
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def std(self):
+        if self.count < 2:
+            return 0.0
+        mean = self.mean()
+        return math.sqrt(max(self.squares - self.count * mean * mean, 0.0) / (self.count - 1))
+
+    def interval(self):
+        """
+        Returns:
+            tuple: 95% confidence interval for the mean.
+        """
+        margin = Z_95 * self.std() / math.sqrt(self.count) if self.count else 0.0
+        return self.mean() - margin, self.mean() + margin
+
+    def to_list(self):
+        return [self.count, self.total, self.squares]
+
+
+class Tally:
+    """
+    What a shard reports: net results per hand and per unit of first bet, the money wagered, and
+    the per-unit results bucketed by the true count the round was bet at.
+    """
+
+    def __init__(self):
+        self.net = Accumulator()
+        self.units = Accumulator()
+        self.wagered = 0.0
+        self.buckets = {}
+
+    def add(self, bet, net, true_count):
+        self.net.add(net)
+        self.units.add(net / bet)
+        self.wagered += bet
+        bucket = max(-TRUE_COUNT_LIMIT, min(TRUE_COUNT_LIMIT, round(true_count)))
+        if bucket not in self.buckets:
+            self.buckets[bucket] = Accumulator()
+        self.buckets[bucket].add(net / bet)
+
+    def merge(self, other):
+        self.net.merge(other.net)
+        self.units.merge(other.units)
+        self.wagered += other.wagered
+        for bucket, accumulator in other.buckets.items():
+            if bucket not in self.buckets:
+                self.buckets[bucket] = Accumulator()
+            self.buckets[bucket].merge(accumulator)
+
+    def to_dict(self):
+        return {
+            'net': self.net.to_list(),
+            'units': self.units.to_list(),
+            'wagered': self.wagered,
+            'buckets': {str(bucket): accumulator.to_list() for bucket, accumulator in self.buckets.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        tally = cls()
+        tally.net = Accumulator(*data['net'])
+        tally.units = Accumulator(*data['units'])
+        tally.wagered = data['wagered']
+        tally.buckets = {int(bucket): Accumulator(*values) for bucket, values in data['buckets'].items()}
+        return tally
+
+
+def shard_seed(seed, shard):
+    """
+    Seed for shard number shard of a run: the shard-th child of the run's SeedSequence.
+    """
+    state = np.random.SeedSequence(seed, spawn_key=(shard,)).generate_state(2, np.uint64)
+    return int(state[0]) << 64 | int(state[1])
+
+
+def load_checkpoint(path):
+    """
+    Read finished shards from a checkpoint. A line cut off by a killed run is dropped from the
+    file so new shards append cleanly.
+
+    Returns:
+        list of dict: One record per finished shard, its chart as a chart_id.
+    """
+    if not os.path.exists(path):
+        return []
+    with open(path, 'rb') as file:
+        data = file.read()
+    complete = data[:data.rfind(b'\n') + 1]
+    if len(complete) != len(data):
+        with open(path, 'wb') as file:
+            file.write(complete)
+    records = [json.loads(line) for line in complete.decode().splitlines() if line.strip()]
+    for record in records:
+        # older checkpoints stored the --chart argument as given
+        record['config']['chart'] = chart_id(record['config']['chart'])
+    return records
+
+
+def group_checkpoint(records):
+    """
+    Merge checkpoint records by the settings that played them, counting each shard once.
+
+    Returns:
+        dict: settings as sorted JSON -> Tally
+    """
+    totals = {}
+    seen = set()
+    for record in records:
+        config = json.dumps(record['config'], sort_keys=True)
+        if (config, record['shard']) not in seen:
+            seen.add((config, record['shard']))
+            totals.setdefault(config, Tally()).merge(Tally.from_dict(record['tally']))
+    return totals
+
+
+def run_shard(task):
+    """
+    Play one shard with the bot and an unlimited bankroll.
+
+    Parameters:
+        task (tuple): (shard index, rounds, run seed, decks, cut_range, chart, hit_soft_17)
+
+    Returns:
+        tuple: (shard index, Tally as a dict)
+    """
+    shard, rounds, seed, decks, cut_range, chart, hit_soft_17 = task
+    table = Table([Seat('Bot', BotStrategy(chart), balance=math.inf)], decks, cut_range, shard_seed(seed, shard),
+                  hit_soft_17=hit_soft_17, shoe_batch=SHOE_BATCH)
+    tally = Tally()
+    for _ in range(rounds):
+        for seat, bet, net in table.play_round():
+            tally.add(bet, net, table.true_count)
+    return shard, tally.to_dict()
+
+
+def run_simulation(hands, seed=0, processes=None, shard_size=SHARD_SIZE, decks=6, cut_range=None,
+                   chart=DEFAULT_CHART, hit_soft_17=False, path='sim_blackjack.jsonl'):
+    """
+    Play hands rounds in shards of shard_size, streaming each finished shard to path.
+
+    Parameters:
+        hands (int): Rounds in the whole run, rounded up to whole shards.
+        seed (int): Seed of the run; shard seeds are spawned from it.
+        processes (int): Worker processes, defaults to the number of cores. 1 plays in this process.
+        shard_size (int): Rounds per shard.
+        decks (int): Decks in the shoe.
+        cut_range (tuple): Cards dealt before the cut card; None scales it to the shoe.
+        chart (str): The bot's strategy chart file, or the name of one in strategy_charts/.
+        hit_soft_17 (bool): The dealer hits soft 17.
+        path (str): JSON lines checkpoint, appended to and used to resume.
+
+    Returns:
+        Tally: Every shard of the run merged, old and new.
+    """
+    cut_range = cut_range_for(decks, cut_range)
+    config = {'seed': seed, 'shard_size': shard_size, 'decks': decks, 'cut_range': list(cut_range),
+              'chart': chart_id(chart), 'hit_soft_17': hit_soft_17}
+    shards = math.ceil(hands / shard_size)
+    total = Tally()
+    done = set()
+    for record in load_checkpoint(path):
+        if record['config'] == config and record['shard'] < shards and record['shard'] not in done:
+            done.add(record['shard'])
+            total.merge(Tally.from_dict(record['tally']))
+    todo = [(shard, shard_size, seed, decks, tuple(cut_range), chart, hit_soft_17)
+            for shard in range(shards) if shard not in done]
+    if done:
+        print(f"Resuming: {len(done)} shards already in {path}, {len(todo)} to play")
+    if not todo:
+        return total
+
+    start = time.perf_counter()
+    if processes == 1:
+        pool = None
+        finished_shards = map(run_shard, todo)
+    else:
+        pool = multiprocessing.Pool(processes)
+        finished_shards = pool.imap_unordered(run_shard, todo)
+    with open(path, 'a') as file:
+        for finished, (shard, tally) in enumerate(finished_shards, 1):
+            file.write(json.dumps({'config': config, 'shard': shard, 'tally': tally}) + '\n')
+            file.flush()
+            total.merge(Tally.from_dict(tally))
+            elapsed = time.perf_counter() - start
+            print(f"{finished}/{len(todo)} shards, {finished * shard_size / elapsed:,.0f} hands/s")
+    if pool is not None:
+        pool.close()
+        pool.join()
+    return total
+
+
+def report(tally, title=''):
+    n = tally.net.count
+    if not n:
+        print("No hands.")
+        return
+    low, high = tally.net.interval()
+    print(f"\n---{title}{n:,} hands---")
+    print(f"EV per hand: ${tally.net.mean():+.4f} (95% CI {low:+.4f} - {high:+.4f}), std ${tally.net.std():.2f}")
+    low, high = tally.units.interval()
+    print(f"EV per unit of first bet: {tally.units.mean():+.4f} (95% CI {low:+.4f} - {high:+.4f}), "
+          f"std {tally.units.std():.3f}")
+    print(f"Net per dollar wagered: {tally.net.total / tally.wagered:+.4%}")
+    print("\nEV per unit by true count (95% CI):")
+    for bucket in sorted(tally.buckets):
+        accumulator = tally.buckets[bucket]
+        low, high = accumulator.interval()
+        print(f"  {bucket:+3d}: {accumulator.mean():+.4f} ({low:+.4f} - {high:+.4f}) "
+              f"over {accumulator.count / n:6.2%} of hands")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate the blackjack bot across a process pool.")
+    parser.add_argument('--hands', type=int, default=10000000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--processes', type=int, default=None,
+                        help="worker processes (default: one per core)")
+    parser.add_argument('--shard-size', type=int, default=SHARD_SIZE)
+    parser.add_argument('--decks', type=int, default=6)
+    parser.add_argument('--cut-range', type=int, nargs=2, default=None,
+                        help="cards dealt before the cut card comes out, low and high "
+                             "(default: 88-91.5%% of the shoe)")
+    parser.add_argument('--chart', default=DEFAULT_CHART, help="strategy chart file, or 's17' / 'h17'")
+    parser.add_argument('--h17', action='store_true', help="the dealer hits soft 17")
+    parser.add_argument('--checkpoint', default='sim_blackjack.jsonl')
+    parser.add_argument('--report-only', action='store_true')
+    args = parser.parse_args()
+
+    if args.report_only:
+        totals = group_checkpoint(load_checkpoint(args.checkpoint))
+        if not totals:
+            report(Tally())
+        for config, total in sorted(totals.items()):
+            report(total, f"{config}: ")
+    else:
+        total = run_simulation(args.hands, args.seed, args.processes, args.shard_size, args.decks,
+                               args.cut_range, args.chart, args.h17, args.checkpoint)
+        report(total)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Basic strategy charts for the blackjack bot, compiled to arrays.
+
+A chart file (see strategy_charts/) lists an action per dealer upcard for
+every hard total, soft hand and pair, in the notation of the bot's old
+cheat sheets:
+
+    H    hit
+    S    stand
+    D/H  double if allowed, otherwise hit    (D alone means the same)
+    D/S  double if allowed, otherwise stand
+    P/H  split if allowed, otherwise hit     (P alone means the same)
+
+compile_chart() turns one into an int8 array indexed by (hand kind,
+total, upcard value) with an action code per cell; anything the chart
+leaves out is a hit. A pair is indexed by the value of one card (Aces 11),
+everything else by the hand's total. Chart.lookup is the same array as a
+flat list, so a decision is one index into it.
+"""
+
+import json
+import os
+import numpy as np
+
+HARD, SOFT, PAIR = range(3)
+HIT, STAND, DOUBLE_HIT, DOUBLE_STAND, SPLIT_HIT = range(5)
+CODES = {'H': HIT, 'S': STAND, 'D': DOUBLE_HIT, 'D/H': DOUBLE_HIT, 'D/S': DOUBLE_STAND, 'P': SPLIT_HIT,
+         'P/H': SPLIT_HIT}
+TOTALS = 22
+UPCARDS = 12
+CHART_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'strategy_charts')
+DEFAULT_CHART = os.path.join(CHART_DIR, 's17.json')
+
+
+def rank_value(rank):
+    return 11 if rank == 'A' else int(rank)
+
+
+def compile_chart(data):
+    """
+    Parameters:
+        data (dict): A parsed chart file.
+
+    Returns:
+        numpy.ndarray: int8 action codes, shape (3, TOTALS, UPCARDS).
+    """
+    upcards = [rank_value(rank) for rank in data['upcards']]
+    actions = np.full((3, TOTALS, UPCARDS), HIT, dtype=np.int8)
+    for kind, section in ((HARD, 'hard'), (SOFT, 'soft'), (PAIR, 'pairs')):
+        for hand, row in data.get(section, {}).items():
+            if kind == HARD:
+                index = int(hand)
+            else:
+                first, second = (rank_value(rank) for rank in hand.split(','))
+                index = first + second if kind == SOFT else first
+            if not 0 <= index < TOTALS or len(row) != len(upcards):
+                raise ValueError(f"bad {section} row {hand!r}: {len(row)} entries for {len(upcards)} upcards")
+            for upcard, entry in zip(upcards, row):
+                if entry not in CODES:
+                    raise ValueError(f"unknown action {entry!r} in {section} row {hand!r}")
+                actions[kind, index, upcard] = CODES[entry]
+    return actions
+
+
+class Chart:
+    def __init__(self, actions, name=''):
+        """
+        Parameters:
+            actions (numpy.ndarray): Compiled codes, as from compile_chart.
+            name (str): What the chart is for.
+        """
+        self.actions = actions
+        self.name = name
+        self.lookup = actions.ravel().tolist()
+
+    def __repr__(self):
+        return f"Chart({self.name!r})"
+
+    def action(self, kind, total, upcard):
+        return self.lookup[(kind * TOTALS + total) * UPCARDS + upcard]
+
+
+# path -> Chart, so every bot in a process shares one compiled chart per file
+charts = {}
+
+
+def chart_path(path=DEFAULT_CHART):
+    """
+    Parameters:
+        path (str): A chart file, or the name of one in strategy_charts/ ('s17', 'h17' or 's17.json').
+
+    Returns:
+        str: The chart file's absolute path.
+    """
+    if not os.path.exists(path):
+        for name in (path + '.json', path):
+            if os.path.exists(os.path.join(CHART_DIR, name)):
+                path = os.path.join(CHART_DIR, name)
+                break
+    return os.path.realpath(path)
+
+
+def chart_id(path=DEFAULT_CHART):
+    """
+    The same string for every way of naming one chart, and independent of where the checkout is:
+    the file's path relative to strategy_charts/ ('s17.json'), or its absolute path outside it.
+    """
+    path = chart_path(path)
+    relative = os.path.relpath(path, os.path.realpath(CHART_DIR))
+    return path if relative.startswith(os.pardir) else relative
+
+
+def load_chart(path=DEFAULT_CHART):
+    """
+    Read and compile a chart file, once per file.
+
+    Parameters:
+        path (str): A chart file, or the name of one in strategy_charts/ ('s17', 'h17').
+    """
+    path = chart_path(path)
+    if path not in charts:
+        with open(path) as file:
+            data = json.load(file)
+        charts[path] = Chart(compile_chart(data), data.get('name', os.path.basename(path)))
+    return charts[path]
@@ -0,0 +1,332 @@
+"""
+Packed 64-bit board representation for 2048.
+
+Each cell holds the exponent of its tile in 4 bits (0 is empty, 1 is a 2,
+2 is a 4, ... 15 is 32768). Cell (r, c) lives at bit 4 * (4 * r + c), so
+every row is one 16-bit chunk. All four moves are table lookups on those
+chunks, with a transpose to turn columns into rows for up/down.
+
+Directions match SmartAI: 0 = left, 1 = right, 2 = up, 3 = down.
+"""
+
+LEFT, RIGHT, UP, DOWN = 0, 1, 2, 3
+DIRECTIONS = (LEFT, RIGHT, UP, DOWN)
+
+ROW_MASK = 0xFFFF
+MAX_EXPONENT = 15
+
+
+def _unpack_row(row):
+    return [(row >> (4 * c)) & 0xF for c in range(4)]
+
+
+def _pack_row(cells):
+    row = 0
+    for c, cell in enumerate(cells):
+        row |= cell << (4 * c)
+    return row
+
+
+def _reverse_row(row):
+    return ((row >> 12) & 0xF) | ((row >> 4) & 0xF0) | ((row << 4) & 0xF00) | ((row << 12) & 0xF000)
+
+
+def _spread_row(row):
+    """
+    Turn a 16-bit row into a 64-bit column: nibble c goes to row c, column 0.
+    """
+    return (row & 0xF) | ((row & 0xF0) << 12) | ((row & 0xF00) << 24) | ((row & 0xF000) << 36)
+
+
+def _merge_row_left(cells):
+    """
+    Slide and merge one row of exponents to the left, the same way merge_left does for tile values.
+
+    Parameters:
+        cells (list of int): Four exponents.
+
+    Returns:
+        tuple: (merged exponents, points scored by the merges)
+    """
+    tiles = [cell for cell in cells if cell != 0]
+    merged = []
+    points = 0
+    skip = False
+    for i in range(len(tiles)):
+        if skip:
+            skip = False
+            continue
+        if i + 1 < len(tiles) and tiles[i] == tiles[i + 1]:
+            exponent = min(tiles[i] + 1, MAX_EXPONENT)
+            merged.append(exponent)
+            points += 1 << exponent
+            skip = True
+        else:
+            merged.append(tiles[i])
+    merged.extend([0] * (4 - len(merged)))
+    return merged, points
+
+
+def _build_tables():
+    row_left = [0] * 65536
+    row_right = [0] * 65536
+    col_up = [0] * 65536
+    col_down = [0] * 65536
+    row_score = [0] * 65536
+    row_empty = [0] * 65536
+    for row in range(65536):
+        cells = _unpack_row(row)
+        merged, points = _merge_row_left(cells)
+        left = _pack_row(merged)
+        row_left[row] = left
+        row_score[row] = points
+        row_empty[row] = cells.count(0)
+        reversed_row = _reverse_row(row)
+        right = _reverse_row(_pack_row(_merge_row_left(_unpack_row(reversed_row))[0]))
+        row_right[row] = right
+        col_up[row] = _spread_row(left)
+        col_down[row] = _spread_row(right)
+    return row_left, row_right, col_up, col_down, row_score, row_empty
+
+
+ROW_LEFT, ROW_RIGHT, COL_UP, COL_DOWN, ROW_SCORE, ROW_EMPTY = _build_tables()
+
+
+def transpose(board):
+    """
+    Swap rows and columns of a packed board.
+    """
+    a1 = board & 0xF0F00F0FF0F00F0F
+    a2 = board & 0x0000F0F00000F0F0
+    a3 = board & 0x0F0F00000F0F0000
+    a = a1 | (a2 << 12) | (a3 >> 12)
+    b1 = a & 0xFF00FF0000FF00FF
+    b2 = a & 0x00FF00FF00000000
+    b3 = a & 0x00000000FF00FF00
+    return b1 | (b2 >> 24) | (b3 << 24)
+
+
+def flip_horizontal(board):
+    """
+    Mirror a packed board left to right.
+    """
+    return (((board & 0x000F000F000F000F) << 12) | ((board & 0x00F000F000F000F0) << 4)
+            | ((board & 0x0F000F000F000F00) >> 4) | ((board & 0xF000F000F000F000) >> 12))
+
+
+def flip_vertical(board):
+    """
+    Mirror a packed board top to bottom.
+    """
+    return (((board & 0xFFFF) << 48) | ((board & 0xFFFF0000) << 16)
+            | ((board >> 16) & 0xFFFF0000) | (board >> 48))
+
+
+def symmetries(board):
+    """
+    All 8 rotations and reflections of a board, in the order used by SYMMETRY_DIRECTIONS.
+    """
+    h = flip_horizontal(board)
+    t = transpose(board)
+    th = flip_horizontal(t)
+    return (board, h, flip_vertical(board), flip_vertical(h),
+            t, th, flip_vertical(t), flip_vertical(th))
+
+
+def canonical(board):
+    """
+    The smallest of a board's 8 symmetries, used as a transposition key.
+
+    Returns:
+        tuple: (canonical board, index of the symmetry that produced it)
+    """
+    forms = symmetries(board)
+    key = min(forms)
+    return key, forms.index(key)
+
+
+def move_left(board):
+    return (ROW_LEFT[board & ROW_MASK]
+            | (ROW_LEFT[(board >> 16) & ROW_MASK] << 16)
+            | (ROW_LEFT[(board >> 32) & ROW_MASK] << 32)
+            | (ROW_LEFT[board >> 48] << 48))
+
+
+def move_right(board):
+    return (ROW_RIGHT[board & ROW_MASK]
+            | (ROW_RIGHT[(board >> 16) & ROW_MASK] << 16)
+            | (ROW_RIGHT[(board >> 32) & ROW_MASK] << 32)
+            | (ROW_RIGHT[board >> 48] << 48))
+
+
+def move_up(board):
+    t = transpose(board)
+    return (COL_UP[t & ROW_MASK]
+            | (COL_UP[(t >> 16) & ROW_MASK] << 4)
+            | (COL_UP[(t >> 32) & ROW_MASK] << 8)
+            | (COL_UP[t >> 48] << 12))
+
+
+def move_down(board):
+    t = transpose(board)
+    return (COL_DOWN[t & ROW_MASK]
+            | (COL_DOWN[(t >> 16) & ROW_MASK] << 4)
+            | (COL_DOWN[(t >> 32) & ROW_MASK] << 8)
+            | (COL_DOWN[t >> 48] << 12))
+
+
+MOVES = (move_left, move_right, move_up, move_down)
+
+
+def all_moves(board):
+    """
+    Apply all four moves at once, sharing the row extraction and the transpose.
+
+    Parameters:
+        board (int): The packed board.
+
+    Returns:
+        tuple of int: The boards after left, right, up and down, in direction order.
+    """
+    left, right, up, down = ROW_LEFT, ROW_RIGHT, COL_UP, COL_DOWN
+    r0 = board & ROW_MASK
+    r1 = (board >> 16) & ROW_MASK
+    r2 = (board >> 32) & ROW_MASK
+    r3 = board >> 48
+    t = transpose(board)
+    c0 = t & ROW_MASK
+    c1 = (t >> 16) & ROW_MASK
+    c2 = (t >> 32) & ROW_MASK
+    c3 = t >> 48
+    return (left[r0] | left[r1] << 16 | left[r2] << 32 | left[r3] << 48,
+            right[r0] | right[r1] << 16 | right[r2] << 32 | right[r3] << 48,
+            up[c0] | up[c1] << 4 | up[c2] << 8 | up[c3] << 12,
+            down[c0] | down[c1] << 4 | down[c2] << 8 | down[c3] << 12)
+
+
+def move(board, direction):
+    """
+    Apply a move to a packed board.
+
+    Parameters:
+        board (int): The packed board.
+        direction (int): 0 = left, 1 = right, 2 = up, 3 = down.
+
+    Returns:
+        int: The new board. Equal to the input if the move does nothing.
+    """
+    return MOVES[direction](board)
+
+
+def move_score(board, direction):
+    """
+    Points earned by merges when a move is applied to a packed board.
+
+    Parameters:
+        board (int): The packed board, before the move.
+        direction (int): 0 = left, 1 = right, 2 = up, 3 = down.
+
+    Returns:
+        int: The sum of the merged tile values.
+    """
+    if direction >= UP:
+        board = transpose(board)
+    return (ROW_SCORE[board & ROW_MASK]
+            + ROW_SCORE[(board >> 16) & ROW_MASK]
+            + ROW_SCORE[(board >> 32) & ROW_MASK]
+            + ROW_SCORE[board >> 48])
+
+
+def empty_count(board):
+    return (ROW_EMPTY[board & ROW_MASK]
+            + ROW_EMPTY[(board >> 16) & ROW_MASK]
+            + ROW_EMPTY[(board >> 32) & ROW_MASK]
+            + ROW_EMPTY[board >> 48])
+
+
+def empty_cells(board):
+    """
+    Returns:
+        list of int: Cell indices (4 * r + c) that are empty.
+    """
+    return [i for i in range(16) if not (board >> (4 * i)) & 0xF]
+
+
+def spawn(board, index, exponent):
+    """
+    Place a tile with the given exponent in an empty cell.
+    """
+    return board | (exponent << (4 * index))
+
+
+def legal_moves(board):
+    return [d for d in DIRECTIONS if MOVES[d](board) != board]
+
+
+def is_over(board):
+    if empty_count(board):
+        return False
+    return move_left(board) == board and move_up(board) == board
+
+
+def max_tile(board):
+    return 1 << max((board >> (4 * i)) & 0xF for i in range(16))
+
+
+def to_board(grid):
+    """
+    Pack a 4x4 list-of-lists grid of tile values into a 64-bit board.
+    """
+    board = 0
+    for r in range(4):
+        for c in range(4):
+            value = grid[r][c]
+            if value:
+                board |= (value.bit_length() - 1) << (4 * (4 * r + c))
+    return board
+
+
+def to_grid(board):
+    """
+    Unpack a 64-bit board into a 4x4 list-of-lists grid of tile values.
+    """
+    grid = []
+    for r in range(4):
+        row = []
+        for c in range(4):
+            exponent = (board >> (4 * (4 * r + c))) & 0xF
+            row.append(1 << exponent if exponent else 0)
+        grid.append(row)
+    return grid
+
+
+def _symmetry_directions():
+    # symmetries() applies an optional transpose, then a horizontal flip, then a vertical flip
+    swap_transpose = (UP, DOWN, LEFT, RIGHT)
+    swap_horizontal = (RIGHT, LEFT, UP, DOWN)
+    swap_vertical = (LEFT, RIGHT, DOWN, UP)
+    maps = []
+    for transposed in (False, True):
+        for horizontal, vertical in ((False, False), (True, False), (False, True), (True, True)):
+            mapping = []
+            for d in DIRECTIONS:
+                if transposed:
+                    d = swap_transpose[d]
+                if horizontal:
+                    d = swap_horizontal[d]
+                if vertical:
+                    d = swap_vertical[d]
+                mapping.append(d)
+            maps.append(tuple(mapping))
+    inverses = []
+    for mapping in maps:
+        inverse = [0] * 4
+        for d in DIRECTIONS:
+            inverse[mapping[d]] = d
+        inverses.append(tuple(inverse))
+    return tuple(maps), tuple(inverses)
+
+
+# SYMMETRY_DIRECTIONS[k][d]: move d on a board is move SYMMETRY_DIRECTIONS[k][d] on symmetries(board)[k].
+# SYMMETRY_INVERSE[k] maps a move on the transformed board back.
+SYMMETRY_DIRECTIONS, SYMMETRY_INVERSE = _symmetry_directions()
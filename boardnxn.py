@@ -0,0 +1,287 @@
+"""
+Packed boards for N x N 2048 (5x5, 6x6, ...).
+
+Same layout as board2048, just wider: cell (r, c) holds its exponent in B
+bits at bit B * (N * r + c), so every row is one BN-bit chunk of a Python
+int. 4 bits stop at 32768, which bigger boards get past, so B is wide
+enough for the largest tile an N x N board can hold, 2 ** (N * N + 1): 5
+bits for 5x5, 6 for 6x6. A full table of every possible row would be
+2 ** (BN) entries, so each BoardEngine fills its row table the first time
+it meets a row; a game only ever meets a few thousand.
+
+engine(size) returns an object with board2048's functions (move,
+all_moves, move_score, empty_cells, spawn, legal_moves, is_over, max_tile,
+to_grid, to_board) for that size. For 4x4 that is board2048 itself.
+
+    python boardnxn.py    # move and AI throughput for 4x4, 5x5 and 6x6
+"""
+
+import random
+import time
+import board2048
+from board2048 import LEFT, RIGHT, UP, DIRECTIONS
+
+# which entry of a row's table entry each move reads (see BoardEngine.build_row)
+LEFT_ROW, RIGHT_ROW, SCORE, LEFT_COLUMN, RIGHT_COLUMN, COLUMN, EMPTY, MONOTONICITY = range(8)
+# AI moves timed per size by main()
+BENCHMARK_MOVES = 300
+
+
+def _merge_line_left(cells, max_exponent):
+    """
+    Slide and merge one line of exponents to the left, like board2048._merge_row_left for any length.
+
+    Parameters:
+        cells (list of int): The line's exponents.
+        max_exponent (int): The largest exponent a cell can hold; a merge past it raises OverflowError.
+
+    Returns:
+        tuple: (merged exponents, points scored by the merges)
+    """
+    tiles = [cell for cell in cells if cell != 0]
+    merged = []
+    points = 0
+    i = 0
+    while i < len(tiles):
+        if i + 1 < len(tiles) and tiles[i] == tiles[i + 1]:
+            exponent = tiles[i] + 1
+            if exponent > max_exponent:
+                raise OverflowError(f"a {1 << exponent} tile does not fit in a cell")
+            merged.append(exponent)
+            points += 1 << exponent
+            i += 2
+        else:
+            merged.append(tiles[i])
+            i += 1
+    merged.extend([0] * (len(cells) - len(merged)))
+    return merged, points
+
+
+def _line_monotonicity(values):
+    """
+    The monotonicity term of SmartAI.grid_quality for one line of tile values.
+    """
+    prev_value = -1
+    inc_score = 0
+    dec_score = 0
+    for tile_value in values:
+        inc_score += tile_value
+        if tile_value <= prev_value or prev_value == -1:
+            dec_score += tile_value
+            if tile_value < prev_value:
+                inc_score -= prev_value
+        prev_value = tile_value
+    return max(inc_score, dec_score)
+
+
+class BoardEngine:
+    def __init__(self, size):
+        """
+        Parameters:
+            size (int): Cells per side.
+        """
+        self.size = size
+        self.cells = size * size
+        # bits per cell, enough for the exponent of a 2 ** (cells + 1) tile
+        self.cell_bits = (self.cells + 1).bit_length()
+        self.cell_mask = (1 << self.cell_bits) - 1
+        self.row_bits = self.cell_bits * size
+        self.row_mask = (1 << self.row_bits) - 1
+        self.row_shifts = [self.row_bits * r for r in range(size)]
+        self.column_shifts = [self.cell_bits * c for c in range(size)]
+        self.cell_shifts = [self.cell_bits * i for i in range(self.cells)]
+        # row -> tuple indexed by LEFT_ROW, RIGHT_ROW, ...; filled as rows turn up
+        self.row_table = {}
+
+    def __repr__(self):
+        return f"BoardEngine({self.size})"
+
+    def unpack_row(self, row):
+        mask = self.cell_mask
+        return [(row >> shift) & mask for shift in self.column_shifts]
+
+    def pack_row(self, cells):
+        row = 0
+        for shift, cell in zip(self.column_shifts, cells):
+            row |= cell << shift
+        return row
+
+    def spread_row(self, cells):
+        """
+        Turn a row of exponents into a column: cell c goes to row c, column 0.
+        """
+        column = 0
+        for shift, cell in zip(self.row_shifts, cells):
+            column |= cell << shift
+        return column
+
+    def build_row(self, row):
+        cells = self.unpack_row(row)
+        left, points = _merge_line_left(cells, self.cell_mask)
+        right = _merge_line_left(cells[::-1], self.cell_mask)[0][::-1]
+        values = [1 << cell if cell else 0 for cell in cells]
+        entry = (self.pack_row(left), self.pack_row(right), points,
+                 self.spread_row(left), self.spread_row(right), self.spread_row(cells),
+                 cells.count(0), _line_monotonicity(values))
+        self.row_table[row] = entry
+        return entry
+
+    def rows(self, board):
+        table = self.row_table
+        mask = self.row_mask
+        entries = []
+        for shift in self.row_shifts:
+            row = (board >> shift) & mask
+            entry = table.get(row)
+            entries.append(entry if entry is not None else self.build_row(row))
+        return entries
+
+    def transpose(self, board):
+        t = 0
+        for shift, entry in zip(self.column_shifts, self.rows(board)):
+            t |= entry[COLUMN] << shift
+        return t
+
+    def move(self, board, direction):
+        if direction == LEFT or direction == RIGHT:
+            part = LEFT_ROW if direction == LEFT else RIGHT_ROW
+            moved = 0
+            for shift, entry in zip(self.row_shifts, self.rows(board)):
+                moved |= entry[part] << shift
+            return moved
+        part = LEFT_COLUMN if direction == UP else RIGHT_COLUMN
+        moved = 0
+        for shift, entry in zip(self.column_shifts, self.rows(self.transpose(board))):
+            moved |= entry[part] << shift
+        return moved
+
+    def all_moves(self, board):
+        """
+        Returns:
+            tuple of int: The boards after left, right, up and down, in direction order.
+        """
+        left = right = up = down = 0
+        for shift, entry in zip(self.row_shifts, self.rows(board)):
+            left |= entry[LEFT_ROW] << shift
+            right |= entry[RIGHT_ROW] << shift
+        for shift, entry in zip(self.column_shifts, self.rows(self.transpose(board))):
+            up |= entry[LEFT_COLUMN] << shift
+            down |= entry[RIGHT_COLUMN] << shift
+        return left, right, up, down
+
+    def move_score(self, board, direction):
+        if direction >= UP:
+            board = self.transpose(board)
+        return sum(entry[SCORE] for entry in self.rows(board))
+
+    def empty_count(self, board):
+        return sum(entry[EMPTY] for entry in self.rows(board))
+
+    def empty_cells(self, board):
+        """
+        Returns:
+            list of int: Cell indices (N * r + c) that are empty.
+        """
+        mask = self.cell_mask
+        return [i for i, shift in enumerate(self.cell_shifts) if not (board >> shift) & mask]
+
+    def spawn(self, board, index, exponent):
+        return board | (exponent << self.cell_shifts[index])
+
+    def legal_moves(self, board):
+        return [d for d, moved in zip(DIRECTIONS, self.all_moves(board)) if moved != board]
+
+    def is_over(self, board):
+        if self.empty_count(board):
+            return False
+        return self.move(board, LEFT) == board and self.move(board, UP) == board
+
+    def max_tile(self, board):
+        return 1 << max((board >> shift) & self.cell_mask for shift in self.cell_shifts)
+
+    def quality(self, board):
+        """
+        SmartAI.grid_quality for this size: monotonicity of every row and column plus 8 per empty cell.
+        """
+        score = 0
+        for entry in self.rows(board):
+            score += entry[MONOTONICITY] + 8 * entry[EMPTY]
+        for entry in self.rows(self.transpose(board)):
+            score += entry[MONOTONICITY]
+        return score
+
+    def to_board(self, grid):
+        board = 0
+        for r in range(self.size):
+            for c in range(self.size):
+                value = grid[r][c]
+                if value:
+                    board |= (value.bit_length() - 1) << self.cell_shifts[self.size * r + c]
+        return board
+
+    def to_grid(self, board):
+        grid = []
+        for r in range(self.size):
+            row = []
+            for c in range(self.size):
+                exponent = (board >> self.cell_shifts[self.size * r + c]) & self.cell_mask
+                row.append(1 << exponent if exponent else 0)
+            grid.append(row)
+        return grid
+
+
+# size -> engine, so every game of a size shares one row table
+engines = {4: board2048}
+
+
+def engine(size):
+    """
+    Returns:
+        The board functions for size x size boards: board2048 for 4, a shared BoardEngine otherwise.
+    """
+    if size not in engines:
+        engines[size] = BoardEngine(size)
+    return engines[size]
+
+
+def main():
+    from ai2048 import ExpectimaxAI, RandomAI, SmartAI
+    from game2048 import Game
+
+    for size in (4, 5, 6):
+        board_engine = engine(size)
+        # positions from random games, so the row tables see realistic rows
+        boards = []
+        for seed in range(20):
+            game = Game(seed, size)
+            agent = RandomAI(seed, size)
+            while not game.is_over():
+                boards.append(game.board)
+                game.step(agent.next_move(game.board))
+        start = time.perf_counter()
+        for board in boards:
+            board_engine.all_moves(board)
+        elapsed = time.perf_counter() - start
+        print(f"{size}x{size}: {4 * len(boards) / elapsed:.0f} moves/s over {len(boards)} positions")
+
+        agents = [('expectimax depth 2', ExpectimaxAI(size, depth=2))]
+        if size == 4:
+            agents.append(('SmartAI depth 2', SmartAI(depth=2)))
+        positions = random.Random(0).sample(boards, 200)
+        for name, agent in agents:
+            start = time.perf_counter()
+            for board in positions:
+                agent.next_move(board)
+            elapsed = time.perf_counter() - start
+            print(f"  {name}: {elapsed / len(positions) * 1000:.2f} ms/move")
+        # the first moves of a game, which get slower as the board fills up
+        game = Game(0, size)
+        agent = ExpectimaxAI(size, depth=2)
+        start = time.perf_counter()
+        while game.moves < BENCHMARK_MOVES and not game.is_over():
+            game.step(agent.next_move(game.board))
+        elapsed = time.perf_counter() - start
+        print(f"  expectimax depth 2: first {game.moves} moves of a game at {game.moves / elapsed:.0f} moves/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Self-play datasets of 2048 positions, for training evaluators.
+
+Every position an agent moves from becomes one RECORD: the packed board,
+the move it chose, the agent's search value for that move (SmartAI's
+last_value, NaN for agents without one) and the final score of the game.
+
+Each worker process writes its own shard as a series of .npy chunk files of
+at most chunk_size records. A chunk is filled through a memory map and only
+renamed to its final name once complete, so a worker holds one game and one
+chunk at a time however big the dataset gets, and the chunks load zero-copy
+with np.load(mmap_mode='r').
+
+    python dataset2048.py --agent smart --games 1000 --option budget_ms=20 --out data_2048
+"""
+
+import argparse
+import glob
+import math
+import multiprocessing
+import os
+import time
+import numpy as np
+import ai2048
+from game2048 import Game
+from tournament2048 import parse_options
+
+RECORD = np.dtype([
+    ('board', '<u8'),
+    ('move', 'u1'),
+    ('value', '<f4'),
+    ('final_score', '<u4'),
+    ('seed', '<i8'),
+])
+CHUNK_SIZE = 1 << 16
+
+
+class ChunkWriter:
+    """
+    Appends records to chunk files prefix-00000.npy, prefix-00001.npy, ...
+    """
+    def __init__(self, prefix, chunk_size=CHUNK_SIZE):
+        self.prefix = prefix
+        self.chunk_size = chunk_size
+        self.chunks = 0
+        self.chunk = None
+        self.count = 0
+        self.total = 0
+
+    def chunk_path(self, index):
+        return f"{self.prefix}-{index:05d}.npy"
+
+    def write(self, records):
+        offset = 0
+        while offset < len(records):
+            if self.chunk is None:
+                self.chunk = np.lib.format.open_memmap(self.chunk_path(self.chunks) + '.tmp', mode='w+',
+                                                       dtype=RECORD, shape=(self.chunk_size,))
+                self.count = 0
+            n = min(len(records) - offset, self.chunk_size - self.count)
+            self.chunk[self.count:self.count + n] = records[offset:offset + n]
+            self.count += n
+            self.total += n
+            offset += n
+            if self.count == self.chunk_size:
+                self.finish_chunk()
+
+    def finish_chunk(self):
+        path = self.chunk_path(self.chunks)
+        self.chunk.flush()
+        if self.count == self.chunk_size:
+            del self.chunk
+            os.replace(path + '.tmp', path)
+        else:
+            # the last chunk of a shard is cut down to the records it holds
+            np.save(path, self.chunk[:self.count])
+            del self.chunk
+            os.remove(path + '.tmp')
+        self.chunk = None
+        self.chunks += 1
+
+    def close(self):
+        if self.chunk is not None:
+            self.finish_chunk()
+
+
+def play_records(agent, seed):
+    """
+    Play one game and return a record for every position the agent moved from.
+
+    Returns:
+        numpy.ndarray: RECORD array, one row per move.
+    """
+    game = Game(seed)
+    boards = []
+    moves = []
+    values = []
+    while not game.is_over():
+        board = game.board
+        direction = agent.next_move(board)
+        if not game.step(direction):
+            break
+        value = getattr(agent, 'last_value', None)
+        boards.append(board)
+        moves.append(direction)
+        values.append(math.nan if value is None else value)
+    records = np.empty(len(boards), dtype=RECORD)
+    records['board'] = boards
+    records['move'] = moves
+    records['value'] = values
+    records['final_score'] = game.score
+    records['seed'] = seed
+    return records
+
+
+def generate_shard(task):
+    """
+    Play the seeds of one shard and write their records to its chunk files.
+
+    Parameters:
+        task (tuple): (agent name, agent options, seeds, chunk file prefix, chunk size)
+
+    Returns:
+        int: Records written.
+    """
+    agent_name, options, seeds, prefix, chunk_size = task
+    agent = ai2048.AGENTS[agent_name](**options)
+    writer = ChunkWriter(prefix, chunk_size)
+    try:
+        for seed in seeds:
+            writer.write(play_records(agent, seed))
+    finally:
+        writer.close()
+        if hasattr(agent, 'close'):
+            agent.close()
+    return writer.total
+
+
+def generate(agent_name, games, out, seed=0, shards=None, options=None, chunk_size=CHUNK_SIZE):
+    """
+    Play games seed .. seed + games - 1 across shards worker processes and write the
+    records to out/shard-SSS-CCCCC.npy. Shard s plays every shards-th seed starting at
+    seed + s, so the same arguments always produce the same files.
+
+    Returns:
+        int: Records written.
+    """
+    shards = shards or os.cpu_count()
+    options = options or {}
+    os.makedirs(out, exist_ok=True)
+    tasks = [(agent_name, options, range(seed + s, seed + games, shards),
+              os.path.join(out, f"shard-{s:03d}"), chunk_size) for s in range(shards)]
+    if shards == 1:
+        return generate_shard(tasks[0])
+    with multiprocessing.Pool(shards) as pool:
+        return sum(pool.map(generate_shard, tasks))
+
+
+def chunk_paths(out):
+    return sorted(glob.glob(os.path.join(out, 'shard-*.npy')))
+
+
+def load_chunks(out):
+    """
+    Yields:
+        numpy.memmap: Each finished chunk in out, mapped read-only without copying.
+    """
+    for path in chunk_paths(out):
+        yield np.load(path, mmap_mode='r')
+
+
+def load_dataset(out):
+    """
+    Returns:
+        numpy.ndarray: Every record in out, concatenated in memory.
+    """
+    chunks = list(load_chunks(out))
+    return np.concatenate(chunks) if chunks else np.empty(0, dtype=RECORD)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write 2048 self-play positions to .npy chunks.")
+    parser.add_argument('--agent', default='smart', choices=sorted(ai2048.AGENTS))
+    parser.add_argument('--games', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--shards', type=int, default=None, help="worker processes, one shard each")
+    parser.add_argument('--option', action='append', help="agent keyword argument, e.g. budget_ms=20")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--out', default='data_2048')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    total = generate(args.agent, args.games, args.out, args.seed, args.shards,
+                     parse_options(args.option), args.chunk_size)
+    elapsed = time.perf_counter() - start
+    print(f"{total} positions from {args.games} games in {elapsed:.1f}s ({total / elapsed:.0f} positions/s)")
+    print(f"{len(chunk_paths(args.out))} chunks in {args.out}")
+
+
+if __name__ == "__main__":
+    main()
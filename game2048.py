@@ -0,0 +1,139 @@
+"""
+Headless 2048 game. No pygame and no module globals, so any number of games
+can run in one process; 2048.py and bot2048.py just draw a Game.
+"""
+
+import random
+import sys
+import time
+import boardnxn
+
+
+class Game:
+    def __init__(self, seed=None, size=4):
+        """
+        Start a new game with two random tiles.
+
+        Parameters:
+            seed (int): Seed for the game's own RNG. The same seed and moves give the same game.
+            size (int): Cells per side (see boardnxn).
+        """
+        self.seed = seed
+        self.size = size
+        self.engine = boardnxn.engine(size)
+        self.rng = random.Random(seed)
+        self.board = 0
+        self.score = 0
+        self.moves = 0
+        # one byte per spawn, with the move that led to it (see replay2048); the format
+        # only has room for 16 cells, so bigger boards are not logged
+        self.log = bytearray() if size == 4 else None
+        self.add_new_tile()
+        self.add_new_tile()
+
+    @property
+    def grid(self):
+        return self.engine.to_grid(self.board)
+
+    def add_new_tile(self, direction=0):
+        empty_tiles = self.engine.empty_cells(self.board)
+        if empty_tiles:
+            cell = self.rng.choice(empty_tiles)
+            exponent = 1 if self.rng.random() < 0.9 else 2
+            self.board = self.engine.spawn(self.board, cell, exponent)
+            if self.log is not None:
+                self.log.append(direction << 5 | (exponent - 1) << 4 | cell)
+
+    def step(self, direction):
+        """
+        Make a move and, if anything moved, add a new tile.
+
+        Parameters:
+            direction (int): 0 = left, 1 = right, 2 = up, 3 = down.
+
+        Returns:
+            bool: True if the board changed.
+        """
+        new_board = self.engine.move(self.board, direction)
+        if new_board == self.board:
+            return False
+        self.score += self.engine.move_score(self.board, direction)
+        self.board = new_board
+        self.moves += 1
+        self.add_new_tile(direction)
+        return True
+
+    def legal_moves(self):
+        return self.engine.legal_moves(self.board)
+
+    def is_over(self):
+        return self.engine.is_over(self.board)
+
+    def max_tile(self):
+        return self.engine.max_tile(self.board)
+
+
+def play(game, agent):
+    """
+    Let an agent play a game to the end.
+
+    Returns:
+        float: Seconds spent in the agent's next_move.
+    """
+    think_time = 0
+    while not game.is_over():
+        start = time.perf_counter()
+        direction = agent.next_move(game.board)
+        think_time += time.perf_counter() - start
+        if not game.step(direction):
+            # the agent picked a move that does nothing; it would do it again forever
+            break
+    return think_time
+
+
+def play_game(agent, seed=None, size=4):
+    """
+    Let an agent play one new game to the end.
+
+    Parameters:
+        agent: Anything with a next_move(board) method (see ai2048).
+        seed (int): Seed for the game.
+        size (int): Cells per side; the agent has to handle boards of that size.
+
+    Returns:
+        dict: seed, score, max_tile, moves and think_time (seconds spent in next_move).
+    """
+    game = Game(seed, size)
+    think_time = play(game, agent)
+    return {
+        'seed': seed,
+        'score': game.score,
+        'max_tile': game.max_tile(),
+        'moves': game.moves,
+        'think_time': think_time,
+    }
+
+
+def play_games(n, agent, seed=0):
+    """
+    Play n games in a row with one agent. Game i uses seed + i.
+
+    Returns:
+        list of dict: One play_game result per game.
+    """
+    return [play_game(agent, seed + i) for i in range(n)]
+
+
+def main():
+    from ai2048 import RandomAI
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    start = time.perf_counter()
+    results = play_games(n, RandomAI(0))
+    elapsed = time.perf_counter() - start
+    moves = sum(result['moves'] for result in results)
+    print(f"{n} games, {moves} moves in {elapsed:.2f}s ({n / elapsed:.1f} games/s, {moves / elapsed:.0f} moves/s)")
+
+
+if __name__ == "__main__":
+    main()
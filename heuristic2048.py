@@ -0,0 +1,230 @@
+"""
+2048 board evaluation.
+
+grid_quality_batch scores a whole stack of grids in one call with the same
+monotonicity + empty-cell heuristic as SmartAI.grid_quality.
+
+RowHeuristic goes further: every term of the heuristic only depends on one
+row or one column, so each term is precomputed for all 65536 possible
+16-bit rows and a board scores with 8 table lookups. The terms are weighted
+when the tables are built, so trying other weights costs nothing per board.
+
+    python heuristic2048.py    # compare both against SmartAI.grid_quality
+"""
+
+import os
+import random
+import time
+import numpy as np
+import board2048
+
+SHIFTS = np.arange(0, 64, 4, dtype=np.uint64)
+ROW_SHIFTS = np.arange(0, 64, 16, dtype=np.uint64)
+TERMS = ('monotonicity', 'empty', 'merges')
+
+# term name -> 65536 values, built or loaded once per process
+row_terms_cache = {}
+
+
+def boards_to_grids(boards):
+    """
+    Unpack packed boards into tile values.
+
+    Parameters:
+        boards (list of int): Packed boards (see board2048).
+
+    Returns:
+        numpy.ndarray: N x 4 x 4 int64 array of tile values.
+    """
+    packed = np.array(boards, dtype=np.uint64)
+    exponents = ((packed[:, None] >> SHIFTS) & np.uint64(0xF)).astype(np.int64)
+    grids = np.where(exponents > 0, np.left_shift(1, exponents), 0)
+    return grids.reshape(-1, 4, 4)
+
+
+def line_monotonicity(lines):
+    """
+    The monotonicity term of SmartAI.grid_quality for each line of four tile values.
+
+    Parameters:
+        lines (numpy.ndarray): ... x 4 int64 tile values, in traversal order.
+
+    Returns:
+        numpy.ndarray: One int64 score per line.
+    """
+    prev_value = np.full(lines.shape[:-1], -1, dtype=np.int64)
+    inc_score = np.zeros(lines.shape[:-1], dtype=np.int64)
+    dec_score = np.zeros(lines.shape[:-1], dtype=np.int64)
+    for i in range(4):
+        tile_value = lines[..., i]
+        inc_score += tile_value
+        falling = (tile_value <= prev_value) | (prev_value == -1)
+        dec_score += np.where(falling, tile_value, 0)
+        inc_score -= np.where(falling & (tile_value < prev_value), prev_value, 0)
+        prev_value = tile_value
+    return np.maximum(inc_score, dec_score)
+
+
+def grid_quality_batch(grids):
+    """
+    Score many grids at once. Matches SmartAI.grid_quality exactly.
+
+    Parameters:
+        grids (array-like): N x 4 x 4 tile values.
+
+    Returns:
+        numpy.ndarray: N int64 scores.
+    """
+    grids = np.asarray(grids, dtype=np.int64)
+    # every column (top to bottom) and every row (left to right) as an N x 8 x 4 stack
+    lines = np.concatenate((grids.transpose(0, 2, 1), grids), axis=1)
+    mono_score = line_monotonicity(lines).sum(axis=1)
+    empty_score = (grids == 0).sum(axis=(1, 2)) * 8
+    return mono_score + empty_score
+
+
+def board_quality_batch(boards):
+    """
+    Score packed boards in one call.
+
+    Returns:
+        list of int: One score per board, as plain Python ints.
+    """
+    return grid_quality_batch(boards_to_grids(boards)).tolist()
+
+
+def build_row_terms():
+    """
+    Compute every heuristic term for all 65536 rows.
+
+    Returns:
+        dict: term name -> int64 array indexed by the 16-bit row.
+            monotonicity: the grid_quality monotonicity score of the row.
+            empty: empty cells in the row.
+            merges: neighbouring pairs that would merge once the row slides.
+    """
+    rows = np.arange(65536, dtype=np.int64)
+    exponents = (rows[:, None] >> np.arange(0, 16, 4)) & 0xF
+    values = np.where(exponents > 0, np.left_shift(1, exponents), 0)
+    merges = np.zeros(65536, dtype=np.int64)
+    for row in range(65536):
+        tiles = [cell for cell in board2048._unpack_row(row) if cell]
+        merges[row] = sum(1 for i in range(len(tiles) - 1) if tiles[i] == tiles[i + 1])
+    return {
+        'monotonicity': line_monotonicity(values),
+        'empty': (exponents == 0).sum(axis=1),
+        'merges': merges,
+    }
+
+
+def row_terms(cache_path=None):
+    """
+    The per-row terms, from memory, from cache_path if it exists, or freshly built
+    (and saved to cache_path if one is given).
+    """
+    if not row_terms_cache:
+        if cache_path and os.path.exists(cache_path):
+            with np.load(cache_path) as data:
+                row_terms_cache.update({term: data[term] for term in TERMS})
+        else:
+            row_terms_cache.update(build_row_terms())
+            if cache_path:
+                np.savez(cache_path, **row_terms_cache)
+    return row_terms_cache
+
+
+class RowHeuristic:
+    def __init__(self, monotonicity=1, empty=8, merges=0, cache_path=None):
+        """
+        Weighted row/column lookup tables. The default weights reproduce SmartAI.grid_quality
+        exactly.
+
+        Parameters:
+            monotonicity (float): Weight of the monotonicity score of every row and column.
+            empty (float): Weight per empty cell.
+            merges (float): Weight per pair of mergeable neighbours in every row and column.
+            cache_path (str): Optional .npz file to load the raw terms from, or save them to.
+        """
+        terms = row_terms(cache_path)
+        line = monotonicity * terms['monotonicity'] + merges * terms['merges']
+        # empty cells are counted once, on the rows
+        self.row_array = line + empty * terms['empty']
+        self.column_array = line
+        self.row_table = self.row_array.tolist()
+        self.column_table = self.column_array.tolist()
+
+    def score(self, board):
+        rows = self.row_table
+        columns = self.column_table
+        t = board2048.transpose(board)
+        return (rows[board & 0xFFFF] + rows[(board >> 16) & 0xFFFF]
+                + rows[(board >> 32) & 0xFFFF] + rows[board >> 48]
+                + columns[t & 0xFFFF] + columns[(t >> 16) & 0xFFFF]
+                + columns[(t >> 32) & 0xFFFF] + columns[t >> 48])
+
+    def score_batch(self, boards):
+        """
+        Score packed boards with NumPy table lookups.
+
+        Returns:
+            numpy.ndarray: One score per board.
+        """
+        packed = np.array(boards, dtype=np.uint64)
+        transposed = np.array([board2048.transpose(board) for board in boards], dtype=np.uint64)
+        rows = ((packed[:, None] >> ROW_SHIFTS) & np.uint64(0xFFFF)).astype(np.int64)
+        columns = ((transposed[:, None] >> ROW_SHIFTS) & np.uint64(0xFFFF)).astype(np.int64)
+        return self.row_array[rows].sum(axis=1) + self.column_array[columns].sum(axis=1)
+
+
+def random_boards(n, seed=0):
+    rng = random.Random(seed)
+    boards = []
+    for _ in range(n):
+        board = 0
+        for i in range(16):
+            if rng.random() < 0.6:
+                board |= rng.randint(1, 11) << (4 * i)
+        boards.append(board)
+    return boards
+
+
+def main():
+    from ai2048 import SmartAI
+
+    boards = random_boards(20000)
+    ai = SmartAI()
+
+    start = time.perf_counter()
+    expected = [ai.grid_quality(board2048.to_grid(board)) for board in boards]
+    scalar_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = board_quality_batch(boards)
+    batch_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    small = []
+    for i in range(0, len(boards), 32):
+        small.extend(board_quality_batch(boards[i:i + 32]))
+    small_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    heuristic = RowHeuristic()
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    looked_up = [heuristic.score(board) for board in boards]
+    lookup_time = time.perf_counter() - start
+
+    assert batched == expected and small == expected, "batched scores differ from SmartAI.grid_quality"
+    assert looked_up == expected, "row table scores differ from SmartAI.grid_quality"
+    print(f"{len(boards)} boards, identical scores")
+    print(f"SmartAI.grid_quality: {len(boards) / scalar_time:12.0f} boards/s")
+    print(f"batch of {len(boards)}:     {len(boards) / batch_time:12.0f} boards/s ({scalar_time / batch_time:.1f}x)")
+    print(f"batches of 32:        {len(boards) / small_time:12.0f} boards/s ({scalar_time / small_time:.1f}x)")
+    print(f"row tables:           {len(boards) / lookup_time:12.0f} boards/s ({scalar_time / lookup_time:.1f}x),"
+          f" built in {build_time:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Monte Carlo rollout agent for 2048.
+
+For each legal move, MonteCarloAI plays rollouts from the board after the
+move: horizon moves of random (or greedy) play. It then picks the move with
+the best average score gained. Rollouts run in batches of batch games,
+stepped together in a VecEnv. Batches are spread over a process pool if
+processes is set.
+
+Rollouts go round by round, one batch per move still in the running. After
+each round, any move whose mean is below the leader's by more than
+confidence standard errors drops out. The search stops when one move is
+left, every move has had its rollouts, or the time budget is spent. Every
+batch is seeded from the agent's seed, the board, the round and the move,
+so a position always gets the same rollouts: with or without a pool, and
+whatever games the agent played before.
+
+    python tournament2048.py --agent montecarlo --games 100 --option rollouts=200
+"""
+
+import math
+import multiprocessing
+import time
+import numpy as np
+import board2048
+from vecenv2048 import VecEnv, game_over, move_boards, random_directions
+
+POLICIES = ('random', 'greedy')
+MASK_32 = 0xFFFFFFFF
+
+
+def run_rollouts(task):
+    """
+    Play count rollouts from one afterstate.
+
+    Parameters:
+        task (tuple): (afterstate, count, horizon, policy, seed)
+
+    Returns:
+        tuple: (count, sum, sum of squares) of the points gained
+    """
+    afterstate, count, horizon, policy, seed = task
+    env = VecEnv(count, seed, np.full(count, afterstate, dtype=np.uint64))
+    env.boards = env.spawn(env.boards)
+    env.done = game_over(env.boards)
+    rng = env.rng
+    for _ in range(horizon):
+        if env.done.all():
+            break
+        legal = env.legal_moves()
+        if policy == 'greedy':
+            # biggest merge first, ties broken at random
+            points = np.stack([move_boards(env.boards, np.full(count, d))[1] for d in board2048.DIRECTIONS], axis=1)
+            directions = ((points + rng.random(points.shape)) * legal).argmax(axis=1)
+        else:
+            directions = random_directions(legal, rng)
+        env.step(directions)
+    gained = env.scores.astype(np.float64)
+    return count, gained.sum(), (gained * gained).sum()
+
+
+class MonteCarloAI:
+    def __init__(self, rollouts=100, horizon=20, batch=25, policy='random', budget_ms=None, confidence=2.5,
+                 processes=None, seed=0):
+        """
+        Parameters:
+            rollouts (int): Most rollouts per legal move.
+            horizon (int): Moves per rollout after the root move.
+            batch (int): Rollouts per task.
+            policy (str): 'random' or 'greedy' (the move that merges most) play in rollouts.
+            budget_ms (float): Stop starting new rounds once this much time has passed.
+            confidence (float): Standard errors a move has to trail the leader by to drop out.
+            processes (int): Run batches on a pool of this many processes.
+            seed (int): Seed for the rollouts.
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"policy must be one of {POLICIES}, not {policy!r}")
+        self.rollouts = rollouts
+        self.horizon = horizon
+        self.batch = batch
+        self.policy = policy
+        self.budget_ms = budget_ms
+        self.confidence = confidence
+        self.processes = processes
+        self.seed = seed
+        self.pool = None
+        self.last_value = None
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool = None
+
+    def next_move(self, board):
+        moves = board2048.legal_moves(board)
+        if len(moves) <= 1:
+            self.last_value = None
+            return moves[0] if moves else 0
+        deadline = time.perf_counter() + self.budget_ms / 1000 if self.budget_ms is not None else None
+        rewards = {d: board2048.move_score(board, d) for d in moves}
+        # direction -> [rollouts, sum, sum of squares]
+        totals = {d: [0, 0.0, 0.0] for d in moves}
+        candidates = list(moves)
+        round_number = 0
+        while len(candidates) > 1:
+            todo = [d for d in candidates if totals[d][0] < self.rollouts]
+            if not todo or (deadline is not None and time.perf_counter() > deadline):
+                break
+            tasks = [(board2048.move(board, d), min(self.batch, self.rollouts - totals[d][0]), self.horizon,
+                      self.policy, self.batch_seed(board, round_number, d)) for d in todo]
+            round_number += 1
+            for d, result in zip(todo, self.map(tasks)):
+                for i in range(3):
+                    totals[d][i] += result[i]
+            candidates = self.survivors(candidates, rewards, totals)
+        best = max(candidates, key=lambda d: rewards[d] + self.mean(totals[d]))
+        self.last_value = rewards[best] + self.mean(totals[best])
+        return best
+
+    def batch_seed(self, board, round_number, direction):
+        """
+        Seed for the rollouts of one move in one round, from the position alone.
+        """
+        entropy = [self.seed, board & MASK_32, board >> 32, round_number, direction]
+        return int(np.random.SeedSequence(entropy).generate_state(1, np.uint64)[0])
+
+    def map(self, tasks):
+        if self.processes:
+            if self.pool is None:
+                self.pool = multiprocessing.Pool(self.processes)
+            return self.pool.map(run_rollouts, tasks)
+        return map(run_rollouts, tasks)
+
+    @staticmethod
+    def mean(total):
+        return total[1] / total[0] if total[0] else 0.0
+
+    def survivors(self, candidates, rewards, totals):
+        """
+        The candidates that are not clearly worse than the leader.
+        """
+        stats = {}
+        for d in candidates:
+            n, total, squares = totals[d]
+            mean = total / n
+            variance = max(squares / n - mean * mean, 0.0)
+            stats[d] = (rewards[d] + mean, variance / n)
+        leader = max(candidates, key=lambda d: stats[d][0])
+        value, error = stats[leader]
+        return [d for d in candidates
+                if value - stats[d][0] <= self.confidence * math.sqrt(error + stats[d][1])]
@@ -0,0 +1,228 @@
+"""
+N-tuple network for 2048, trained by temporal-difference learning.
+
+The network values an afterstate (the board right after a move, before the
+tile spawns) as the sum of one weight per n-tuple per symmetry. Each tuple
+is 4 cells, so a table has 16 ** 4 = 65536 weights indexed by the cells'
+exponents, and every table is looked up on all 8 rotations and reflections
+of the board. The tables for the 5 TUPLES sit end to end in one flat
+float32 array, saved as .npy. Loading copies all of it into a Python list
+(about 10 MB), because play and training both look up one weight at a
+time and that is several times faster on a list than on a numpy array.
+
+Training is TD(0) on afterstates: after every move, the previous
+afterstate's value is pulled towards the reward of the move plus the value
+of the new afterstate.
+
+    python ntuple2048.py train --games 20000 --weights ntuple_2048.npy
+    python ntuple2048.py play --games 100 --depth 2
+"""
+
+import argparse
+import os
+import time
+import numpy as np
+import board2048
+from game2048 import Game, play_games
+
+# cells (4 * r + c) of each tuple: the outer and inner row, and the corner, edge and centre squares
+TUPLES = [
+    (0, 1, 2, 3),
+    (4, 5, 6, 7),
+    (0, 1, 4, 5),
+    (1, 2, 5, 6),
+    (5, 6, 9, 10),
+]
+TABLE_SIZE = 1 << 16
+WEIGHTS_PATH = 'ntuple_2048.npy'
+# step size per feature; the error is spread over all len(TUPLES) * 8 of them
+LEARNING_RATE = 0.1
+SPAWNS = ((1, 0.9), (2, 0.1))
+
+
+def build_features():
+    """
+    The shifts to read each tuple on each symmetry of a board, straight from the board.
+
+    Returns:
+        list of tuple: (table offset, shift of cell 0, 1, 2, 3)
+    """
+    # cell i holds exponent i, so each symmetric board shows where every cell came from
+    numbered = sum(i << (4 * i) for i in range(16))
+    features = set()
+    for symmetric in board2048.symmetries(numbered):
+        source = [(symmetric >> (4 * i)) & 0xF for i in range(16)]
+        for t, cells in enumerate(TUPLES):
+            features.add((t * TABLE_SIZE,) + tuple(4 * source[cell] for cell in cells))
+    return sorted(features)
+
+
+FEATURES = build_features()
+
+
+class NTupleNetwork:
+    def __init__(self, weights=None):
+        """
+        Parameters:
+            weights: len(TUPLES) * TABLE_SIZE weights, e.g. from load(); zeros if None.
+        """
+        if weights is None:
+            self.weights = [0.0] * (len(TUPLES) * TABLE_SIZE)
+        else:
+            # scalar lookups on a list are several times faster than on a numpy array
+            self.weights = np.asarray(weights, dtype=np.float32).tolist()
+
+    @classmethod
+    def load(cls, path=WEIGHTS_PATH):
+        """
+        Read every weight in path into a new network; the file is not kept open.
+        """
+        return cls(np.load(path))
+
+    def save(self, path=WEIGHTS_PATH):
+        np.save(path, np.array(self.weights, dtype=np.float32))
+
+    def value(self, board):
+        weights = self.weights
+        total = 0.0
+        for offset, a, b, c, d in FEATURES:
+            total += weights[offset | ((board >> a) & 0xF) | ((board >> b) & 0xF) << 4
+                             | ((board >> c) & 0xF) << 8 | ((board >> d) & 0xF) << 12]
+        return total
+
+    def update(self, board, delta):
+        weights = self.weights
+        for offset, a, b, c, d in FEATURES:
+            weights[offset | ((board >> a) & 0xF) | ((board >> b) & 0xF) << 4
+                    | ((board >> c) & 0xF) << 8 | ((board >> d) & 0xF) << 12] += delta
+
+    def best_afterstate(self, board):
+        """
+        Returns:
+            tuple: (direction, reward, afterstate, reward + value) of the greedy move,
+                or None if no move changes the board.
+        """
+        best = None
+        for d, moved in enumerate(board2048.all_moves(board)):
+            if moved == board:
+                continue
+            reward = board2048.move_score(board, d)
+            total = reward + self.value(moved)
+            if best is None or total > best[3]:
+                best = (d, reward, moved, total)
+        return best
+
+    def train_game(self, seed, learning_rate=LEARNING_RATE):
+        """
+        Play one greedy game and learn from it.
+
+        Returns:
+            Game: The finished game.
+        """
+        game = Game(seed)
+        step = learning_rate / len(FEATURES)
+        previous = None
+        while True:
+            best = self.best_afterstate(game.board)
+            if best is None:
+                break
+            direction, reward, afterstate, total = best
+            if previous is not None:
+                self.update(previous, step * (total - self.value(previous)))
+            previous = afterstate
+            game.step(direction)
+        if previous is not None:
+            # nothing follows the last afterstate
+            self.update(previous, step * -self.value(previous))
+        return game
+
+
+class NTupleAI:
+    def __init__(self, weights_path=WEIGHTS_PATH, depth=1, network=None):
+        """
+        Parameters:
+            weights_path (str): Trained weights (see train()).
+            depth (int): 1 picks the move with the best reward + afterstate value; each extra
+                level averages over the spawns and moves after it, expectimax style.
+            network (NTupleNetwork): Use this network instead of loading weights_path.
+        """
+        self.network = network or NTupleNetwork.load(weights_path)
+        self.depth = depth
+        self.last_value = None
+
+    def next_move(self, board):
+        best_direction = 0
+        best_value = None
+        for d, moved in enumerate(board2048.all_moves(board)):
+            if moved == board:
+                continue
+            value = board2048.move_score(board, d) + self.afterstate_value(moved, self.depth)
+            if best_value is None or value > best_value:
+                best_direction = d
+                best_value = value
+        self.last_value = best_value
+        return best_direction
+
+    def afterstate_value(self, board, depth):
+        if depth <= 1:
+            return self.network.value(board)
+        cells = board2048.empty_cells(board)
+        total = 0.0
+        for cell in cells:
+            for exponent, probability in SPAWNS:
+                child = board2048.spawn(board, cell, exponent)
+                best = 0.0
+                for d, moved in enumerate(board2048.all_moves(child)):
+                    if moved != child:
+                        best = max(best, board2048.move_score(child, d) + self.afterstate_value(moved, depth - 1))
+                total += probability * best
+        return total / len(cells)
+
+
+def train(games, path=WEIGHTS_PATH, seed=0, learning_rate=LEARNING_RATE, report_every=1000):
+    """
+    Train on games seed .. seed + games - 1, starting from the weights in path if there are
+    any, and save the weights to path every report_every games.
+    """
+    network = NTupleNetwork.load(path) if os.path.exists(path) else NTupleNetwork()
+    start = time.perf_counter()
+    scores = []
+    moves = 0
+    for i in range(games):
+        game = network.train_game(seed + i, learning_rate)
+        scores.append(game.score)
+        moves += game.moves
+        if (i + 1) % report_every == 0 or i + 1 == games:
+            network.save(path)
+            elapsed = time.perf_counter() - start
+            reached = sum(1 for s in scores if s >= 20000) / len(scores)
+            print(f"{i + 1} games: mean score {sum(scores) / len(scores):.0f}, score >= 20000 {reached:.1%}, "
+                  f"{moves / elapsed:.0f} moves/s")
+            scores = []
+    return network
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train or play the 2048 n-tuple network.")
+    parser.add_argument('command', choices=['train', 'play'])
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--weights', default=WEIGHTS_PATH)
+    parser.add_argument('--learning-rate', type=float, default=LEARNING_RATE)
+    parser.add_argument('--depth', type=int, default=1)
+    args = parser.parse_args()
+
+    if args.command == 'train':
+        train(args.games, args.weights, args.seed, args.learning_rate)
+        return
+    # play on seeds well away from the training ones
+    results = play_games(args.games, NTupleAI(args.weights, args.depth), args.seed + 1000000)
+    moves = sum(r['moves'] for r in results)
+    think_time = sum(r['think_time'] for r in results)
+    print(f"Mean score {sum(r['score'] for r in results) / len(results):.0f}, "
+          f"2048 reached {sum(1 for r in results if r['max_tile'] >= 2048) / len(results):.1%}, "
+          f"{think_time / max(moves, 1) * 1e6:.0f} us/move")
+
+
+if __name__ == "__main__":
+    main()
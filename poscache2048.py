@@ -0,0 +1,106 @@
+"""
+On-disk cache of searched 2048 positions, shared between runs and processes.
+
+Keys are canonical boards (board2048.canonical); each entry is (depth
+searched, value, best direction in the canonical frame). Entries live in a
+SQLite file in WAL mode, so any number of processes can read it while one
+of them writes, and recently used entries are also kept in memory.
+
+Values depend on how the search scores boards, so every entry is stored
+under a config string; SmartAI uses its probability cutoff and weights.
+
+    SmartAI(cache_path='positions_2048.db')
+    python tournament2048.py --agent smart --games 500 --option cache_path=positions_2048.db
+"""
+
+import os
+import sqlite3
+from ai2048 import TranspositionTable
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS positions (
+    config TEXT NOT NULL,
+    board INTEGER NOT NULL,
+    depth INTEGER NOT NULL,
+    value REAL NOT NULL,
+    direction INTEGER NOT NULL,
+    PRIMARY KEY (config, board)
+)
+"""
+# keeps the deeper of an existing entry and a new one
+UPSERT = """
+INSERT INTO positions (config, board, depth, value, direction) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (config, board) DO UPDATE SET depth = excluded.depth, value = excluded.value,
+    direction = excluded.direction
+WHERE excluded.depth >= positions.depth
+"""
+SELECT = "SELECT depth, value, direction FROM positions WHERE config = ? AND board = ?"
+
+
+def to_signed(board):
+    """
+    SQLite integers are signed 64-bit, so boards with the top bit set are stored negative.
+    """
+    return board - (1 << 64) if board >= 1 << 63 else board
+
+
+class PositionCache:
+    def __init__(self, path, config='', hot_limit=100000):
+        """
+        Parameters:
+            path (str): SQLite file, created if it does not exist.
+            config (str): Only entries stored under this config are read or written.
+            hot_limit (int): Entries kept in memory.
+        """
+        self.path = path
+        self.config = config
+        self.hot = TranspositionTable(hot_limit)
+        self.connection = None
+        self.pid = None
+        self.disk_hits = 0
+
+    def connect(self):
+        # a connection can't cross a fork, so every process opens its own
+        if self.connection is None or self.pid != os.getpid():
+            self.connection = sqlite3.connect(self.path, timeout=30)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            # WAL commits without waiting for fsync; a crash can lose the last entries, never corrupt the file
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.execute(SCHEMA)
+            self.pid = os.getpid()
+        return self.connection
+
+    def get(self, key):
+        """
+        Returns:
+            tuple: (depth, value, direction in the canonical frame), or None.
+        """
+        entry = self.hot.get(key)
+        if entry is None:
+            row = self.connect().execute(SELECT, (self.config, to_signed(key))).fetchone()
+            if row is not None:
+                entry = tuple(row)
+                self.hot.put(key, entry)
+                self.disk_hits += 1
+        return entry
+
+    def put(self, key, entry):
+        """
+        Store an entry, unless a deeper one for the same board is already on disk.
+        """
+        old = self.hot.entries.get(key)
+        if old is not None and old[0] > entry[0]:
+            return
+        self.hot.put(key, entry)
+        connection = self.connect()
+        with connection:
+            connection.execute(UPSERT, (self.config, to_signed(key)) + tuple(entry))
+
+    def __len__(self):
+        row = self.connect().execute("SELECT COUNT(*) FROM positions WHERE config = ?", (self.config,)).fetchone()
+        return row[0]
+
+    def close(self):
+        if self.connection is not None and self.pid == os.getpid():
+            self.connection.close()
+        self.connection = None
@@ -0,0 +1,92 @@
+"""
+Drawing for 2048.py and bot2048.py.
+
+Every tile value is rendered to a surface once, the first time it shows up,
+and only the cells that changed since the last draw are blitted and handed
+back as dirty rects for pygame.display.update.
+"""
+
+import pygame
+
+# Colors
+BACKGROUND_COLOR = (187, 173, 160)
+GRID_COLOR = (205, 193, 180)
+EMPTY_TILE_COLOR = (205, 193, 180)
+TILE_COLORS = {
+    2: (238, 228, 218),
+    4: (237, 224, 200),
+    8: (242, 177, 121),
+    16: (245, 149, 99),
+    32: (246, 124, 95),
+    64: (246, 94, 59),
+    128: (237, 207, 114),
+    256: (237, 204, 97),
+    512: (237, 200, 80),
+    1024: (237, 197, 63),
+    2048: (237, 194, 46)
+}
+TEXT_COLOR = (119, 110, 101)
+
+TILE_SIZE = 100
+# Longest side of the board, in pixels, before tiles are shrunk to fit
+WINDOW_SIZE = 480
+
+
+class BoardRenderer:
+    def __init__(self, size=4, tile_size=None):
+        """
+        Parameters:
+            size (int): Cells per side.
+            tile_size (int): Pixels per cell; by default TILE_SIZE, shrunk so the board fits WINDOW_SIZE.
+        """
+        self.size = size
+        self.tile_size = tile_size or min(TILE_SIZE, WINDOW_SIZE // size)
+        # font size -> font
+        self.fonts = {}
+        self.tile_surfaces = {}
+        self.drawn = None
+
+    @property
+    def width(self):
+        return self.size * self.tile_size
+
+    def tile_surface(self, tile_value):
+        surface = self.tile_surfaces.get(tile_value)
+        if surface is None:
+            surface = pygame.Surface((self.tile_size, self.tile_size))
+            surface.fill(TILE_COLORS.get(min(tile_value, 2048), EMPTY_TILE_COLOR))
+            if tile_value != 0:
+                digits = len(str(tile_value))
+                # long numbers get smaller text so they stay inside the tile
+                font_size = self.tile_size // 2 if digits <= 3 else self.tile_size * 3 // (2 * digits)
+                if font_size not in self.fonts:
+                    self.fonts[font_size] = pygame.font.Font(None, font_size)
+                text = self.fonts[font_size].render(str(tile_value), True, TEXT_COLOR)
+                surface.blit(text, text.get_rect(center=(self.tile_size // 2, self.tile_size // 2)))
+            self.tile_surfaces[tile_value] = surface
+        return surface
+
+    def draw(self, screen, grid):
+        """
+        Blit the cells that differ from the last drawn grid.
+
+        Returns:
+            list of pygame.Rect: The areas that changed, for pygame.display.update.
+        """
+        dirty = []
+        for r in range(self.size):
+            for c in range(self.size):
+                tile_value = grid[r][c]
+                if self.drawn is not None and self.drawn[r][c] == tile_value:
+                    continue
+                rect = pygame.Rect(c * self.tile_size, r * self.tile_size, self.tile_size, self.tile_size)
+                screen.blit(self.tile_surface(tile_value), rect)
+                dirty.append(rect)
+        self.drawn = [row[:] for row in grid]
+        return dirty
+
+    def invalidate(self):
+        """
+        Force a full redraw next time, e.g. after the window was uncovered.
+        """
+        self.drawn = None
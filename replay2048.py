@@ -0,0 +1,189 @@
+"""
+Compact replay logs for 2048 games.
+
+A replay file is FILE_MAGIC followed by records. Each record is a RECORD
+header (flags, seed, final score, log length) and the game's log: one byte
+per spawned tile, the first two for the starting tiles and then one for
+every move.
+
+    bit 0-3  cell the tile spawned in (4 * r + c)
+    bit 4    1 if the tile was a 4
+    bit 5-6  direction of the move before it (0 for the starting tiles)
+
+A typical SmartAI game is a few KB. The spawns are stored, so a replay
+plays back without the RNG. The seed is stored too, so the engine can
+re-run the game and check that it still produces the same spawns and score.
+
+    python replay2048.py record games.rpl --games 1000 --agent random
+    python replay2048.py validate games.rpl
+"""
+
+import argparse
+import os
+import struct
+import time
+import ai2048
+import board2048
+from game2048 import Game, play
+
+FILE_MAGIC = b'2048RPL\x01'
+RECORD = struct.Struct('<BqII')
+SEEDED = 1
+
+
+def encode_game(game):
+    """
+    Returns:
+        bytes: One replay record for a finished (or unfinished) Game.
+    """
+    flags = SEEDED if game.seed is not None else 0
+    return RECORD.pack(flags, game.seed or 0, game.score, len(game.log)) + bytes(game.log)
+
+
+def write_replays(path, games):
+    """
+    Append games to a replay file, creating it if needed.
+    """
+    new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+    with open(path, 'ab') as file:
+        if new_file:
+            file.write(FILE_MAGIC)
+        for game in games:
+            file.write(encode_game(game))
+
+
+def read_replays(path):
+    """
+    Read the records one at a time, so a file of millions of games never sits in memory.
+
+    Yields:
+        dict: seed (None if the game was unseeded), score and log (bytes) of each record.
+
+    Raises:
+        ValueError: If the file is not a replay file or ends partway through a record.
+    """
+    with open(path, 'rb') as file:
+        if file.read(len(FILE_MAGIC)) != FILE_MAGIC:
+            raise ValueError(f"{path} is not a 2048 replay file")
+        while True:
+            header = file.read(RECORD.size)
+            if not header:
+                return
+            if len(header) < RECORD.size:
+                raise ValueError(f"{path} ends partway through a record header")
+            flags, seed, score, length = RECORD.unpack(header)
+            log = file.read(length)
+            if len(log) < length:
+                raise ValueError(f"{path} ends partway through a record's log")
+            yield {
+                'seed': seed if flags & SEEDED else None,
+                'score': score,
+                'log': log,
+            }
+
+
+def replay_log(log):
+    """
+    Play a log back from its recorded spawns alone.
+
+    Returns:
+        tuple: (final board, score, moves)
+
+    Raises:
+        ValueError: If a move does nothing or a tile spawns on an occupied cell.
+    """
+    board = 0
+    score = 0
+    for i, entry in enumerate(log):
+        if i >= 2:
+            direction = entry >> 5
+            moved_board = board2048.move(board, direction)
+            if moved_board == board:
+                raise ValueError(f"move {i - 1} does nothing")
+            score += board2048.move_score(board, direction)
+            board = moved_board
+        cell = entry & 0xF
+        if (board >> (4 * cell)) & 0xF:
+            raise ValueError(f"entry {i} spawns on an occupied cell")
+        board = board2048.spawn(board, cell, (entry >> 4 & 1) + 1)
+    return board, score, max(len(log) - 2, 0)
+
+
+def check_replay(replay):
+    """
+    Replay one record with the current engine.
+
+    Returns:
+        str: What differs from the record, or None if the engine reproduces it.
+    """
+    log = replay['log']
+    try:
+        score = replay_log(log)[1]
+    except ValueError as error:
+        return str(error)
+    if score != replay['score']:
+        return f"score {score} != recorded {replay['score']}"
+    if replay['seed'] is not None:
+        game = Game(replay['seed'])
+        for entry in log[2:]:
+            game.step(entry >> 5)
+        if bytes(game.log) != log:
+            return "engine spawns differ from the recorded ones"
+        if game.score != replay['score']:
+            return f"engine score {game.score} != recorded {replay['score']}"
+    return None
+
+
+def validate(path):
+    """
+    Check every record in a replay file against the current engine.
+
+    Returns:
+        tuple: (records checked, list of (record index, seed, problem) for every record that
+            no longer matches)
+    """
+    count = 0
+    problems = []
+    for i, replay in enumerate(read_replays(path)):
+        count += 1
+        problem = check_replay(replay)
+        if problem:
+            problems.append((i, replay['seed'], problem))
+    return count, problems
+
+
+def record_games(path, n, agent, seed=0):
+    """
+    Play n seeded games (seed, seed + 1, ...) and append their replays to path.
+    """
+    games = []
+    for i in range(n):
+        game = Game(seed + i)
+        play(game, agent)
+        games.append(game)
+    write_replays(path, games)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record and validate 2048 replay files.")
+    parser.add_argument('command', choices=['record', 'validate'])
+    parser.add_argument('path')
+    parser.add_argument('--games', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--agent', default='random', choices=sorted(ai2048.AGENTS))
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.command == 'record':
+        record_games(args.path, args.games, ai2048.AGENTS[args.agent](), args.seed)
+        print(f"Recorded {args.games} games to {args.path} ({os.path.getsize(args.path)} bytes)"
+              f" in {time.perf_counter() - start:.2f}s")
+    else:
+        count, problems = validate(args.path)
+        for index, seed, problem in problems:
+            print(f"game {index} (seed {seed}): {problem}")
+        print(f"{count - len(problems)}/{count} games reproduce ({time.perf_counter() - start:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""
+Play many seeded 2048 games with one agent across a process pool and
+summarize how it did.
+
+Every finished game is appended to a JSON lines file as soon as it comes
+back, tagged with the agent and its options, so a killed run picks up
+where it left off: games already in the file for the same agent, options
+and seed are not played again. --report-only reports every agent and
+options combination in the file separately.
+
+    python tournament2048.py --agent smart --games 500 --option budget_ms=50
+    python tournament2048.py --agent smart --games 20 --processes 1 --option processes=8
+    python tournament2048.py --report-only --results results_2048.jsonl
+"""
+
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import time
+import ai2048
+from game2048 import play_game
+
+REPORT_TILES = [256, 512, 1024, 2048, 4096, 8192, 16384, 32768]
+REPORT_PERCENTILES = [10, 25, 50, 75, 90]
+Z_95 = 1.96
+
+agent = None
+
+
+def init_worker(agent_name, options):
+    """
+    Build one agent per worker process so its caches live as long as the worker.
+    """
+    global agent
+    agent = ai2048.AGENTS[agent_name](**options)
+
+
+def run_game(seed):
+    return play_game(agent, seed)
+
+
+def load_results(path):
+    """
+    Read finished games from a results file. A line cut off by a killed run is dropped
+    from the file so new results append cleanly.
+
+    Returns:
+        list of dict: One record per finished game.
+    """
+    if not os.path.exists(path):
+        return []
+    with open(path, 'rb') as file:
+        data = file.read()
+    complete = data[:data.rfind(b'\n') + 1]
+    if len(complete) != len(data):
+        with open(path, 'wb') as file:
+            file.write(complete)
+    return [json.loads(line) for line in complete.decode().splitlines() if line.strip()]
+
+
+def group_results(results):
+    """
+    Split results by the agent and options that played them, keeping one game per seed.
+
+    Returns:
+        dict: (agent name, options as sorted JSON) -> list of results.
+    """
+    groups = {}
+    for result in results:
+        key = (result.get('agent'), json.dumps(result.get('options'), sort_keys=True))
+        games = groups.setdefault(key, {})
+        games.setdefault(result['seed'], result)
+    return {key: list(games.values()) for key, games in groups.items()}
+
+
+def run_tournament(agent_name, games, seed=0, processes=None, options=None, path='results_2048.jsonl'):
+    """
+    Play games seed .. seed + games - 1 and stream each result to path.
+
+    Parameters:
+        agent_name (str): Key in ai2048.AGENTS.
+        games (int): Number of games in the tournament.
+        seed (int): Seed of the first game.
+        processes (int): Worker processes, defaults to the number of cores. 1 plays the games
+            in this process, for agents that parallelize their own search.
+        options (dict): Keyword arguments for the agent.
+        path (str): JSON lines results file, appended to and used to resume.
+
+    Returns:
+        list of dict: Every result for this agent, options and seeds, old and new.
+    """
+    options = options or {}
+    key = (agent_name, json.dumps(options, sort_keys=True))
+    results = [r for r in group_results(load_results(path)).get(key, []) if seed <= r['seed'] < seed + games]
+    done = {r['seed'] for r in results}
+    todo = [s for s in range(seed, seed + games) if s not in done]
+    if done:
+        print(f"Resuming: {len(done)} games already in {path}, {len(todo)} to play")
+    if not todo:
+        return results
+
+    start = time.perf_counter()
+    if processes == 1:
+        # games in this process, so the agent can run a pool of its own (SmartAI processes=...)
+        init_worker(agent_name, options)
+        games_played = map(run_game, todo)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(processes, init_worker, (agent_name, options))
+        games_played = pool.imap_unordered(run_game, todo)
+    with open(path, 'a') as file:
+        for result in games_played:
+            result['agent'] = agent_name
+            result['options'] = options
+            file.write(json.dumps(result) + '\n')
+            file.flush()
+            results.append(result)
+            finished = len(results) - len(done)
+            if finished % 10 == 0 or finished == len(todo):
+                elapsed = time.perf_counter() - start
+                print(f"{finished}/{len(todo)} games, {finished / elapsed * 60:.1f} games/min")
+    if pool is not None:
+        pool.close()
+        pool.join()
+    elif hasattr(agent, 'close'):
+        agent.close()
+    return results
+
+
+def wilson_interval(successes, n):
+    """
+    95% Wilson score interval for a proportion.
+    """
+    if n == 0:
+        return 0.0, 0.0
+    p = successes / n
+    denominator = 1 + Z_95 ** 2 / n
+    center = (p + Z_95 ** 2 / (2 * n)) / denominator
+    margin = Z_95 * math.sqrt(p * (1 - p) / n + Z_95 ** 2 / (4 * n * n)) / denominator
+    return max(center - margin, 0.0), min(center + margin, 1.0)
+
+
+def percentile_interval(sorted_values, percentile):
+    """
+    Sample percentile with a distribution-free 95% interval from the order statistics.
+
+    Returns:
+        tuple: (estimate, low, high)
+    """
+    n = len(sorted_values)
+    p = percentile / 100
+    spread = Z_95 * math.sqrt(n * p * (1 - p))
+    index = min(int(p * n), n - 1)
+    low = max(int(math.floor(n * p - spread)), 0)
+    high = min(int(math.ceil(n * p + spread)), n - 1)
+    return sorted_values[index], sorted_values[low], sorted_values[high]
+
+
+def report(results, title=''):
+    n = len(results)
+    if not n:
+        print("No results.")
+        return
+    scores = sorted(r['score'] for r in results)
+    mean = sum(scores) / n
+    deviation = math.sqrt(sum((s - mean) ** 2 for s in scores) / (n - 1)) if n > 1 else 0.0
+    moves = sum(r['moves'] for r in results)
+    think_time = sum(r['think_time'] for r in results)
+
+    print(f"\n---{title}{n} games---")
+    print(f"Mean score: {mean:.0f} +/- {Z_95 * deviation / math.sqrt(n):.0f}")
+    print(f"Think time: {think_time / max(moves, 1) * 1000:.2f} ms/move")
+    print("\nScore percentiles (95% CI):")
+    for percentile in REPORT_PERCENTILES:
+        estimate, low, high = percentile_interval(scores, percentile)
+        print(f"  p{percentile}: {estimate} ({low} - {high})")
+    print("\nMax tile reached (95% CI):")
+    for tile in REPORT_TILES:
+        reached = sum(1 for r in results if r['max_tile'] >= tile)
+        if not reached:
+            break
+        low, high = wilson_interval(reached, n)
+        print(f"  {tile:>5}: {reached / n:6.1%} ({low:.1%} - {high:.1%})")
+
+
+def parse_options(pairs):
+    options = {}
+    for pair in pairs or []:
+        key, value = pair.split('=', 1)
+        try:
+            options[key] = json.loads(value)
+        except ValueError:
+            options[key] = value
+    return options
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a 2048 agent over many seeded games.")
+    parser.add_argument('--agent', default='smart', choices=sorted(ai2048.AGENTS))
+    parser.add_argument('--games', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--processes', type=int, default=None,
+                        help="game processes; use 1 with --option processes=N to split each search instead")
+    parser.add_argument('--option', action='append', help="agent keyword argument, e.g. budget_ms=50")
+    parser.add_argument('--results', default='results_2048.jsonl')
+    parser.add_argument('--report-only', action='store_true')
+    args = parser.parse_args()
+
+    if args.report_only:
+        groups = group_results(load_results(args.results))
+        if not groups:
+            report([])
+        for (agent_name, options), results in sorted(groups.items(), key=str):
+            report(results, f"{agent_name} {options}: ")
+    else:
+        results = run_tournament(args.agent, args.games, args.seed, args.processes,
+                                 parse_options(args.option), args.results)
+        report(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+Many 2048 games stepped at once with NumPy.
+
+VecEnv holds B packed boards (see board2048) in one uint64 array and applies
+B moves per step() call: the same row tables as board2048 (so the same
+merges and scores as merge_left and the move functions), then a seeded
+spawn on every board that moved, then the game-over check. Nothing loops
+over boards in Python.
+
+    python vecenv2048.py    # steps/s for random play
+"""
+
+import time
+import numpy as np
+import board2048
+
+U64 = np.uint64
+NIBBLE = U64(0xF)
+ROW_MASK = U64(board2048.ROW_MASK)
+CELL_SHIFTS = np.arange(0, 64, 4, dtype=np.uint64)
+# where the four 16-bit chunks of a board sit, read as rows (left/right) or transposed columns (up/down)
+ROW_SHIFTS = np.array([0, 16, 32, 48], dtype=np.uint64)
+COLUMN_SHIFTS = np.array([0, 4, 8, 12], dtype=np.uint64)
+# direction -> row chunk -> what it becomes; up/down tables already spread the chunk into a column
+MOVE_TABLES = np.array([board2048.ROW_LEFT, board2048.ROW_RIGHT, board2048.COL_UP, board2048.COL_DOWN],
+                       dtype=np.uint64)
+SCORE_TABLE = np.array(board2048.ROW_SCORE, dtype=np.int64)
+EMPTY_TABLE = np.array(board2048.ROW_EMPTY, dtype=np.int64)
+
+
+def transpose(boards):
+    """
+    board2048.transpose for an array of boards.
+    """
+    a1 = boards & U64(0xF0F00F0FF0F00F0F)
+    a2 = boards & U64(0x0000F0F00000F0F0)
+    a3 = boards & U64(0x0F0F00000F0F0000)
+    a = a1 | (a2 << U64(12)) | (a3 >> U64(12))
+    b1 = a & U64(0xFF00FF0000FF00FF)
+    b2 = a & U64(0x00FF00FF00000000)
+    b3 = a & U64(0x00000000FF00FF00)
+    return b1 | (b2 >> U64(24)) | (b3 << U64(24))
+
+
+def move_boards(boards, directions):
+    """
+    Apply one move to each board.
+
+    Parameters:
+        boards (numpy.ndarray): B uint64 packed boards.
+        directions (numpy.ndarray): B directions (0 = left, 1 = right, 2 = up, 3 = down).
+
+    Returns:
+        tuple: (moved boards, points scored by each move)
+    """
+    directions = np.asarray(directions, dtype=np.intp)
+    vertical = directions >= board2048.UP
+    source = np.where(vertical, transpose(boards), boards)
+    rows = ((source[:, None] >> ROW_SHIFTS) & ROW_MASK).astype(np.intp)
+    parts = MOVE_TABLES[directions[:, None], rows]
+    parts <<= np.where(vertical[:, None], COLUMN_SHIFTS, ROW_SHIFTS)
+    moved = parts[:, 0] | parts[:, 1] | parts[:, 2] | parts[:, 3]
+    return moved, SCORE_TABLE[rows].sum(axis=1)
+
+
+def all_moves(boards):
+    """
+    Returns:
+        numpy.ndarray: B x 4 boards after left, right, up and down.
+    """
+    n = len(boards)
+    return np.stack([move_boards(boards, np.full(n, d))[0] for d in board2048.DIRECTIONS], axis=1)
+
+
+def empty_counts(boards):
+    rows = ((boards[:, None] >> ROW_SHIFTS) & ROW_MASK).astype(np.intp)
+    return EMPTY_TABLE[rows].sum(axis=1)
+
+
+def game_over(boards):
+    """
+    Returns:
+        numpy.ndarray: True for every board with no empty cell and no move that changes it.
+    """
+    over = empty_counts(boards) == 0
+    full = boards[over]
+    if len(full):
+        n = len(full)
+        stuck = ((move_boards(full, np.full(n, board2048.LEFT))[0] == full)
+                 & (move_boards(full, np.full(n, board2048.UP))[0] == full))
+        over[over] = stuck
+    return over
+
+
+class VecEnv:
+    def __init__(self, n, seed=None, boards=None):
+        """
+        Start n games, each with two random tiles.
+
+        Parameters:
+            n (int): Number of boards.
+            seed (int): Seed for the spawns of all n games. The same seed and moves give the same games.
+            boards: n packed boards to start from instead of new games.
+        """
+        self.rng = np.random.default_rng(seed)
+        self.boards = np.zeros(n, dtype=np.uint64)
+        self.scores = np.zeros(n, dtype=np.int64)
+        self.moves = np.zeros(n, dtype=np.int64)
+        self.done = np.zeros(n, dtype=bool)
+        if boards is None:
+            self.reset()
+        else:
+            self.boards[:] = boards
+            self.done = game_over(self.boards)
+
+    def __len__(self):
+        return len(self.boards)
+
+    def reset(self, mask=None):
+        """
+        Start new games on the boards in mask (all of them if None).
+        """
+        if mask is None:
+            mask = np.ones(len(self.boards), dtype=bool)
+        self.boards[mask] = 0
+        self.scores[mask] = 0
+        self.moves[mask] = 0
+        self.boards[mask] = self.spawn(self.spawn(self.boards[mask]))
+        self.done[mask] = False
+
+    def spawn(self, boards):
+        """
+        Add a 2 (probability 0.9) or a 4 to a uniformly chosen empty cell of each board.
+        Every board must have an empty cell.
+        """
+        empty = ((boards[:, None] >> CELL_SHIFTS) & NIBBLE) == 0
+        counts = empty.sum(axis=1)
+        # the k-th empty cell, k uniform in 0 .. count - 1
+        k = (self.rng.random(len(boards)) * counts).astype(np.int64)
+        cells = (np.cumsum(empty, axis=1) > k[:, None]).argmax(axis=1)
+        exponents = np.where(self.rng.random(len(boards)) < 0.9, U64(1), U64(2))
+        return boards | (exponents << CELL_SHIFTS[cells])
+
+    def step(self, directions):
+        """
+        Make one move on every board. Boards whose move changes nothing, and finished boards,
+        stay as they are.
+
+        Parameters:
+            directions (numpy.ndarray): B directions (0 = left, 1 = right, 2 = up, 3 = down).
+
+        Returns:
+            tuple of numpy.ndarray: (points scored, which boards moved, which games are over)
+        """
+        moved, points = move_boards(self.boards, directions)
+        changed = (moved != self.boards) & ~self.done
+        points[~changed] = 0
+        moved[changed] = self.spawn(moved[changed])
+        self.boards[changed] = moved[changed]
+        self.scores += points
+        self.moves += changed
+        self.done[changed] = game_over(self.boards[changed])
+        return points, changed, self.done.copy()
+
+    def legal_moves(self):
+        """
+        Returns:
+            numpy.ndarray: B x 4 mask of the moves that would change each board.
+        """
+        return all_moves(self.boards) != self.boards[:, None]
+
+    def max_tiles(self):
+        exponents = (self.boards[:, None] >> CELL_SHIFTS) & NIBBLE
+        return np.left_shift(1, exponents.max(axis=1).astype(np.int64))
+
+
+def random_directions(legal, rng):
+    """
+    A uniformly random legal move for each row of a B x 4 legal mask (0 where nothing is legal).
+    """
+    weights = rng.random(legal.shape) * legal
+    return weights.argmax(axis=1)
+
+
+def main():
+    for n in (1000, 100000):
+        env = VecEnv(n, seed=0)
+        rng = np.random.default_rng(1)
+        steps = 0
+        step_time = 0
+        while steps < 2000000:
+            directions = random_directions(env.legal_moves(), rng)
+            start = time.perf_counter()
+            env.step(directions)
+            step_time += time.perf_counter() - start
+            steps += n
+            env.reset(env.done)
+        print(f"{n} boards: {steps / step_time / 1e6:.2f}M board steps/s")
+
+
+if __name__ == "__main__":
+    main()